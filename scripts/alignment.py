@@ -0,0 +1,316 @@
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+# (tag, i1, i2, j1, j2), as returned by difflib.SequenceMatcher.get_opcodes
+Opcode = Tuple[str, int, int, int, int]
+# (i, j, size): a[i:i + size] == b[j:j + size]
+Block = Tuple[int, int, int]
+
+WORDS_REGEX = re.compile(r"\S+")
+# Text spans up to this number of characters (both sides) are aligned
+# exactly; longer ones are first split at the words they share
+EXACT_SPAN_SIZE = 4096
+
+
+def encode(
+    a: Sequence[Hashable], b: Sequence[Hashable]
+) -> Tuple[List[int], List[int]]:
+    """Maps the items of both sequences to integer codes, so that they are
+    compared as small ints."""
+    codes: Dict[Hashable, int] = {}
+    a_codes = [codes.setdefault(item, len(codes)) for item in a]
+    b_codes = [codes.setdefault(item, len(codes)) for item in b]
+    return a_codes, b_codes
+
+
+def _middle_snake(
+    a: List[int], alo: int, ahi: int, b: List[int], blo: int, bhi: int
+) -> Tuple[int, int, int, int]:
+    """Finds the middle snake of a shortest edit script of a[alo:ahi] and
+    b[blo:bhi] (Myers, 1986), searching from both ends in linear space.
+
+    Returns:
+        Tuple[int, int, int, int]: Start and end (x, y) of the snake,
+        relative to `alo` and `blo`.
+    """
+    n = ahi - alo
+    m = bhi - blo
+    delta = n - m
+    odd = delta & 1
+    max_d = (n + m + 1) // 2
+    offset = max_d + 1
+    vf = [0] * (2 * offset + 1)  # furthest x on each forward diagonal
+    vb = [0] * (2 * offset + 1)  # furthest x on each backward diagonal
+
+    for d in range(max_d + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and vf[offset + k - 1] < vf[offset + k + 1]):
+                x = vf[offset + k + 1]
+            else:
+                x = vf[offset + k - 1] + 1
+            y = x - k
+            x0, y0 = x, y
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            vf[offset + k] = x
+            c = delta - k
+            if odd and -d < c < d and x + vb[offset + c] >= n:
+                return x0, y0, x, y
+
+        for c in range(-d, d + 1, 2):
+            if c == -d or (c != d and vb[offset + c - 1] < vb[offset + c + 1]):
+                x = vb[offset + c + 1]
+            else:
+                x = vb[offset + c - 1] + 1
+            y = x - c
+            x0, y0 = x, y
+            while x < n and y < m and a[ahi - 1 - x] == b[bhi - 1 - y]:
+                x += 1
+                y += 1
+            vb[offset + c] = x
+            k = delta - c
+            if not odd and -d <= k <= d and x + vf[offset + k] >= n:
+                return n - x, m - y, n - x0, m - y0
+
+    raise AssertionError("No middle snake found")
+
+
+def _myers_blocks(
+    a: List[int],
+    alo: int,
+    ahi: int,
+    b: List[int],
+    blo: int,
+    bhi: int,
+    blocks: List[Block],
+):
+    """Appends the matching blocks of a shortest edit script of a[alo:ahi]
+    and b[blo:bhi] to `blocks`, in order."""
+    # Common prefix and suffix
+    prefix = 0
+    while (
+        alo + prefix < ahi
+        and blo + prefix < bhi
+        and a[alo + prefix] == b[blo + prefix]
+    ):
+        prefix += 1
+    if prefix:
+        blocks.append((alo, blo, prefix))
+        alo += prefix
+        blo += prefix
+    suffix = 0
+    while alo < ahi - suffix and blo < bhi - suffix and (
+        a[ahi - 1 - suffix] == b[bhi - 1 - suffix]
+    ):
+        suffix += 1
+    ahi -= suffix
+    bhi -= suffix
+
+    if alo < ahi and blo < bhi:
+        x0, y0, x, y = _middle_snake(a, alo, ahi, b, blo, bhi)
+        _myers_blocks(a, alo, alo + x0, b, blo, blo + y0, blocks)
+        if x > x0:
+            blocks.append((alo + x0, blo + y0, x - x0))
+        _myers_blocks(a, alo + x, ahi, b, blo + y, bhi, blocks)
+
+    if suffix:
+        blocks.append((ahi, bhi, suffix))
+
+
+def _unique_anchors(
+    a: Sequence[Hashable], b: Sequence[Hashable]
+) -> List[Tuple[int, int]]:
+    """Pairs the items that occur once in both sequences and keeps the
+    longest chain of pairs that is increasing on both sides (patience
+    diff)."""
+    a_counts = Counter(a)
+    b_counts = Counter(b)
+    b_positions = {
+        item: j
+        for j, item in enumerate(b)
+        if b_counts[item] == 1 and a_counts[item] == 1
+    }
+    pairs = [
+        (i, b_positions[item])
+        for i, item in enumerate(a)
+        if item in b_positions
+    ]
+
+    # Longest increasing subsequence of the b positions
+    tails: List[int] = []
+    tails_indices: List[int] = []
+    previous = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        pos = bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tails_indices.append(index)
+        else:
+            tails[pos] = j
+            tails_indices[pos] = index
+        previous[index] = tails_indices[pos - 1] if pos else -1
+
+    anchors = []
+    index = tails_indices[-1] if tails_indices else -1
+    while index != -1:
+        anchors.append(pairs[index])
+        index = previous[index]
+    return anchors[::-1]
+
+
+def _word_anchors(
+    a: str, alo: int, ahi: int, b: str, blo: int, bhi: int
+) -> List[Block]:
+    """Gets the words that occur once in both a[alo:ahi] and b[blo:bhi],
+    chained in order, as (i, j, size) blocks."""
+    a_words = list(WORDS_REGEX.finditer(a, alo, ahi))
+    b_words = list(WORDS_REGEX.finditer(b, blo, bhi))
+    anchors = _unique_anchors(
+        [word.group() for word in a_words],
+        [word.group() for word in b_words],
+    )
+    return [
+        (a_words[i].start(), b_words[j].start(), len(a_words[i].group()))
+        for i, j in anchors
+    ]
+
+
+def get_matching_blocks(
+    a: Sequence[Hashable], b: Sequence[Hashable]
+) -> List[Block]:
+    """Gets the matching blocks of an optimal alignment of two sequences.
+
+    The alignment is a shortest edit script found with Myers' O(ND) linear
+    space diff, so the blocks make a longest common subsequence of `a` and
+    `b`. Adjacent blocks are merged.
+
+    Args:
+        a (Sequence[Hashable]): The first sequence.
+        b (Sequence[Hashable]): The second sequence.
+
+    Returns:
+        List[Block]: The (i, j, size) matching blocks, in order.
+    """
+    a_codes, b_codes = encode(a, b)
+    blocks: List[Block] = []
+    _myers_blocks(a_codes, 0, len(a), b_codes, 0, len(b), blocks)
+    return merge_blocks(blocks)
+
+
+def merge_blocks(blocks: List[Block]) -> List[Block]:
+    """Merges the adjacent matching blocks of an ordered list."""
+    merged: List[Block] = []
+    for i, j, size in blocks:
+        if merged:
+            last_i, last_j, last_size = merged[-1]
+            if last_i + last_size == i and last_j + last_size == j:
+                merged[-1] = (last_i, last_j, last_size + size)
+                continue
+        merged.append((i, j, size))
+    return merged
+
+
+def blocks_to_opcodes(
+    blocks: List[Block], len_a: int, len_b: int
+) -> List[Opcode]:
+    """Converts matching blocks to difflib style opcodes.
+
+    The items between two blocks are a "replace" when both sides are not
+    empty, and a "delete" or an "insert" otherwise.
+
+    Returns:
+        List[Opcode]: The opcodes describing how to turn a into b.
+    """
+    opcodes: List[Opcode] = []
+    i = j = 0
+    for ai, bj, size in [*blocks, (len_a, len_b, 0)]:
+        if i < ai and j < bj:
+            opcodes.append(("replace", i, ai, j, bj))
+        elif i < ai:
+            opcodes.append(("delete", i, ai, j, bj))
+        elif j < bj:
+            opcodes.append(("insert", i, ai, j, bj))
+        if size:
+            opcodes.append(("equal", ai, ai + size, bj, bj + size))
+        i, j = ai + size, bj + size
+    return opcodes
+
+
+def get_opcodes(
+    a: Sequence[Hashable], b: Sequence[Hashable]
+) -> List[Opcode]:
+    """Gets difflib style opcodes of an optimal alignment of two sequences.
+
+    Returns:
+        List[Opcode]: The opcodes describing how to turn a into b.
+    """
+    return blocks_to_opcodes(get_matching_blocks(a, b), len(a), len(b))
+
+
+def get_text_matching_blocks(
+    a: str, b: str, exact_size: int = EXACT_SPAN_SIZE
+) -> List[Block]:
+    """Gets the matching blocks of a character alignment of two texts.
+
+    The exact Myers diff costs O((N + M)D), which grows with the square of
+    the text length when the edits grow with it. Spans longer than
+    `exact_size` characters are therefore first split at the words that
+    occur once in both of them, chained in order (patience diff), and the
+    gaps between these words are split in the same way, recursively. The
+    characters of the spans that are short enough, or share no such word,
+    are aligned with the exact diff. The cost is then about linear in the
+    text length, and the alignment is optimal within each span.
+
+    Args:
+        a (str): The first text.
+        b (str): The second text.
+        exact_size (int, optional): Size of the spans aligned exactly.
+        Defaults to EXACT_SPAN_SIZE.
+
+    Returns:
+        List[Block]: The (i, j, size) matching blocks, in order.
+    """
+    a_codes, b_codes = encode(a, b)
+    blocks: List[Block] = []
+    # Spans (alo, ahi, blo, bhi) to align and anchor blocks (i, j, size),
+    # in reverse order
+    stack: List[Tuple[int, ...]] = [(0, len(a), 0, len(b))]
+    while stack:
+        task = stack.pop()
+        if len(task) == 3:
+            blocks.append(task)
+            continue
+
+        alo, ahi, blo, bhi = task
+        anchors = []
+        if ahi - alo + bhi - blo > exact_size:
+            anchors = _word_anchors(a, alo, ahi, b, blo, bhi)
+        if not anchors:
+            _myers_blocks(a_codes, alo, ahi, b_codes, blo, bhi, blocks)
+            continue
+
+        tasks: List[Tuple[int, ...]] = []
+        for i, j, size in anchors:
+            tasks += [(alo, i, blo, j), (i, j, size)]
+            alo, blo = i + size, j + size
+        tasks.append((alo, ahi, blo, bhi))
+        stack += reversed(tasks)
+
+    return merge_blocks(blocks)
+
+
+def get_text_opcodes(
+    a: str, b: str, exact_size: int = EXACT_SPAN_SIZE
+) -> List[Opcode]:
+    """Gets character level difflib style opcodes of an alignment of two
+    texts (see `get_text_matching_blocks`).
+
+    Returns:
+        List[Opcode]: The opcodes describing how to turn a into b.
+    """
+    return blocks_to_opcodes(
+        get_text_matching_blocks(a, b, exact_size), len(a), len(b)
+    )
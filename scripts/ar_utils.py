@@ -1,28 +1,70 @@
+import re
+from functools import lru_cache
+from typing import Any, Iterable
 from unicodedata import normalize
 
 from pyarabic.araby import DIACRITICS, SHADDA, name
 
+# A shadda followed by diacritics is moved after them. This is what swapping
+# each shadda with the next diacritic from left to right did, as the swapped
+# shadda keeps being carried to the end of the diacritics run.
+SHADDA_REGEX = re.compile(
+    f"{SHADDA}([{''.join(re.escape(c) for c in DIACRITICS)}]+)"
+)
+
 
 def reorder_shadda(ar_string: str) -> str:
     """unicodedata.normalize put shadda before diacritics"""
-    list_ar_str = list(ar_string)
-
-    for i in range(len(list_ar_str) - 1):
-        char = list_ar_str[i]
-        next_char = list_ar_str[i + 1]
+    if SHADDA not in ar_string:
+        return ar_string
+    return SHADDA_REGEX.sub(rf"\1{SHADDA}", ar_string)
 
-        if char == SHADDA and next_char in DIACRITICS:
-            list_ar_str[i], list_ar_str[i + 1] = (
-                next_char,
-                char,
-            )  # Swap shadda and diacritic
 
-    return "".join(list_ar_str)
+@lru_cache(maxsize=65536)
+def _normalize_ar(ar_vocalized: str) -> str:
+    if ar_vocalized.isascii():
+        return ar_vocalized
+    return reorder_shadda(normalize("NFC", ar_vocalized))
 
 
 def normalize_ar(ar_vocalized: str, verbose: bool = False) -> str:
-    ar_norm = normalize("NFC", ar_vocalized)
-    ar_norm = reorder_shadda(ar_norm)
+    ar_norm = _normalize_ar(ar_vocalized)
     if verbose:
         print([name(char) for char in ar_norm])
     return ar_norm
+
+
+def normalize_ar_many(texts: Iterable[Any]) -> Any:
+    """Normalize many Arabic strings with `normalize_ar`.
+
+    Repeated strings are normalized once, and strings without non-ASCII
+    characters are returned as is. Values that are not strings, such as
+    missing cells, are kept unchanged.
+
+    Args:
+        texts (Iterable[Any]): A list or iterable of strings, a pandas
+        Series or an Arrow array.
+
+    Returns:
+        Any: The normalized strings, as a Series with the same index for a
+        Series, an Arrow array of the same type for an Arrow array and a
+        list otherwise.
+    """
+
+    def normalize_value(text: Any) -> Any:
+        return _normalize_ar(text) if isinstance(text, str) else text
+
+    # pandas Series
+    if hasattr(texts, "map") and hasattr(texts, "index"):
+        return texts.map(normalize_value)
+
+    # Arrow Array or ChunkedArray
+    if hasattr(texts, "to_pylist"):
+        import pyarrow as pa
+
+        return pa.array(
+            [normalize_value(text) for text in texts.to_pylist()],
+            type=texts.type,
+        )
+
+    return [normalize_value(text) for text in texts]
@@ -1,14 +1,537 @@
 import argparse
 import gzip
+import hashlib
 import json
-from collections import defaultdict
+import multiprocessing
+import os
+import re
+import sqlite3
+from collections import deque
+from contextlib import ExitStack
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import List
-
-from tqdm import tqdm
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
 
 from ar_utils import normalize_ar
 
+# Number of index rows kept in memory before they are spilled to the
+# fingerprints database
+SPILL_BATCH_SIZE = 10_000
+
+
+class DumpEntry(NamedTuple):
+    lang: str  # Language code
+    word: str  # Normalized word
+    pos: str  # Part of speech
+    etymology_number: Optional[int]
+    fingerprint: str  # Hash of the serialized entry
+    line: str  # The entry serialized as `{word: entry_data}`
+
+
+def get_tmp_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.tmp")
+
+
+def group_rows(rows: Iterable[Tuple[str, Any]]) -> Iterator[Tuple[str, list]]:
+    """Groups the values of consecutive (key, value) rows sharing a key."""
+    for key, group in groupby(rows, key=itemgetter(0)):
+        yield key, [value for _, value in group]
+
+
+def write_json_gz(path: Path, items: Iterable[Tuple[str, Any]]) -> Path:
+    """Writes the (key, value) pairs as a gzipped JSON object to a temporary
+    file next to `path`, one pair at a time.
+
+    Returns:
+        Path: The temporary file, to be moved into place by the caller.
+    """
+    tmp_path = get_tmp_path(path)
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        f.write("{")
+        for i, (key, value) in enumerate(items):
+            if i:
+                f.write(", ")
+            f.write(f"{json.dumps(key)}: {json.dumps(value)}")
+        f.write("}")
+    return tmp_path
+
+
+class ReindexedDumpWriter:
+    """Stream reindexed Wiktionary entries to disk.
+
+    The reindexed dump is an uncompressed JSONL file, and the index maps
+    each word to the byte offsets of its lines, so an entry can be read
+    with a single seek (see `wiktionary_lookup.WiktionaryLookup`). Each
+    entry is written as soon as it is added, and its word, key (see
+    `get_key`), fingerprint and byte offset are spilled in batches to the
+    `entries` table of an SQLite database, so memory does not grow with the
+    dump. The offsets index is streamed from that table in word order on
+    `close`, and the database is kept as the fingerprints file for later
+    incremental runs (see `IncrementalDumpWriter`).
+
+    The legacy outputs of the `Step-0` notebook can be written too: the
+    same lines as a gzipped JSONL file, and the index mapping each word to
+    its line numbers, which the notebooks and the `wiki_idx` columns of
+    the interim files refer to.
+
+    All outputs are first written to temporary files next to their
+    destinations and moved into place on `close`, which means a re-run
+    replaces the previous outputs instead of appending to them, and an
+    interrupted run leaves them untouched.
+    """
+
+    def __init__(
+        self,
+        reindexed_path: Path,
+        reindices_path: Path,
+        fingerprints_path: Path,
+        legacy_dump_path: Optional[Path] = None,
+        legacy_reindices_path: Optional[Path] = None,
+    ):
+        """
+        Args:
+            reindexed_path (Path): Path to save the reindexed dump file.
+            reindices_path (Path): Path to save the word to byte offsets
+            index.
+            fingerprints_path (Path): Path to save the SQLite database of
+            the entries keys, fingerprints and byte offsets.
+            legacy_dump_path (Path, optional): Path to save the gzipped
+            reindexed dump file. Defaults to None, which skips it.
+            legacy_reindices_path (Path, optional): Path to save the word
+            to line numbers index. Defaults to None, which skips it.
+        """
+        self.reindexed_path = reindexed_path
+        self.reindices_path = reindices_path
+        self.fingerprints_path = fingerprints_path
+        self.legacy_dump_path = legacy_dump_path
+        self.legacy_reindices_path = legacy_reindices_path
+
+        self._rows: List[Tuple[int, str, str, str, int]] = []
+        self.indx = 0
+        self.offset = 0
+
+        for path in self.get_paths():
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._reindx_obj = open(get_tmp_path(reindexed_path), "wb")
+        self._legacy_obj = None
+        if legacy_dump_path is not None:
+            self._legacy_obj = gzip.open(get_tmp_path(legacy_dump_path), "wb")
+
+        fingerprints_tmp = get_tmp_path(fingerprints_path)
+        if fingerprints_tmp.is_file():
+            fingerprints_tmp.unlink()
+        self.connection = sqlite3.connect(fingerprints_tmp)
+        self.connection.execute(
+            """
+            CREATE TABLE entries (
+                line INTEGER PRIMARY KEY,
+                word TEXT NOT NULL,
+                key TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                offset INTEGER NOT NULL
+            )
+            """
+        )
+
+    @staticmethod
+    def get_key(entry: DumpEntry) -> str:
+        """Gets the key grouping the versions of an entry across dump
+        releases: its word, part of speech and etymology number."""
+        return json.dumps([entry.word, entry.pos, entry.etymology_number])
+
+    def write_line(self, entry: DumpEntry) -> int:
+        """Writes the entry line and returns its byte offset."""
+        offset = self.offset
+        data = entry.line.encode("utf-8") + b"\n"
+        self._reindx_obj.write(data)
+        if self._legacy_obj is not None:
+            self._legacy_obj.write(data)
+        self.offset += len(data)
+        return offset
+
+    def add(self, entry: DumpEntry):
+        """Writes one serialized entry and records its byte offset.
+
+        Args:
+            entry (DumpEntry): The entry to add.
+        """
+        offset = self.write_line(entry)
+        self._rows.append(
+            (
+                self.indx,
+                entry.word,
+                self.get_key(entry),
+                entry.fingerprint,
+                offset,
+            )
+        )
+        self.indx += 1
+        if len(self._rows) >= SPILL_BATCH_SIZE:
+            self.spill()
+
+    def spill(self):
+        """Moves the buffered index rows to the fingerprints database."""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?)", self._rows
+            )
+        self._rows = []
+
+    def close(self):
+        """Writes the indices and moves the outputs into place."""
+        self.close_files()
+        self.spill()
+        with self.connection:
+            self.connection.execute(
+                "CREATE INDEX entries_key ON entries (key, line)"
+            )
+        write_json_gz(
+            self.reindices_path,
+            group_rows(
+                self.connection.execute(
+                    "SELECT word, offset FROM entries ORDER BY word, line"
+                )
+            ),
+        )
+        if self.legacy_reindices_path is not None:
+            write_json_gz(
+                self.legacy_reindices_path,
+                group_rows(
+                    self.connection.execute(
+                        "SELECT word, line FROM entries ORDER BY word, line"
+                    )
+                ),
+            )
+        self.connection.close()
+
+        for path in self.get_paths():
+            os.replace(get_tmp_path(path), path)
+
+    def close_files(self):
+        self._reindx_obj.close()
+        if self._legacy_obj is not None:
+            self._legacy_obj.close()
+
+    def get_paths(self) -> List[Path]:
+        """Gets the paths of the outputs, skipping the unset legacy ones."""
+        paths = [
+            self.reindexed_path,
+            self.reindices_path,
+            self.fingerprints_path,
+            self.legacy_dump_path,
+            self.legacy_reindices_path,
+        ]
+        return [path for path in paths if path is not None]
+
+    def get_tmp_paths(self) -> List[Path]:
+        return [get_tmp_path(path) for path in self.get_paths()]
+
+    def abort(self):
+        """Discards the temporary outputs, keeping any previous ones."""
+        self.close_files()
+        self.connection.close()
+        for tmp_path in self.get_tmp_paths():
+            if tmp_path.is_file():
+                tmp_path.unlink()
+
+    def __enter__(self) -> "ReindexedDumpWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class IncrementalDumpWriter(ReindexedDumpWriter):
+    """Re-extract a new dump release and record how it differs from the
+    previous extraction.
+
+    The outputs are written from scratch as by `ReindexedDumpWriter`, so
+    the reindexed dump file stays in the dump order and holds no stale
+    lines. Once the whole dump is read, its entries are compared in SQL
+    with the fingerprints database of the previous extraction, attached as
+    `old`, by key (see `get_key`): the k-th new entry of a key with a given
+    fingerprint matches the k-th old entry of that key with the same
+    fingerprint and is unchanged. The other entries are paired in order
+    with the unmatched old entries of their key: paired entries are
+    changed, the remaining new ones are added and the remaining old ones
+    are removed. The lines of the changed and added entries are read back
+    from the new reindexed dump file, so none are kept in memory.
+
+    The operations are written to a delta JSONL file, one
+    `{"op": "add" | "change" | "remove", "key": ..., "entry": ...}` object
+    per line, in the dump order, for the downstream stages. All outputs are
+    replaced atomically on `close`.
+    """
+
+    def __init__(
+        self,
+        reindexed_path: Path,
+        reindices_path: Path,
+        fingerprints_path: Path,
+        delta_path: Path,
+        legacy_dump_path: Optional[Path] = None,
+        legacy_reindices_path: Optional[Path] = None,
+    ):
+        """
+        Args:
+            reindexed_path (Path): Path of the reindexed dump file.
+            reindices_path (Path): Path of the word to byte offsets index.
+            fingerprints_path (Path): Path of the fingerprints database,
+            which holds the previous extraction.
+            delta_path (Path): Path to save the delta file.
+            legacy_dump_path (Path, optional): Path of the gzipped
+            reindexed dump file. Defaults to None, which skips it.
+            legacy_reindices_path (Path, optional): Path of the word to line
+            numbers index. Defaults to None, which skips it.
+        """
+        super().__init__(
+            reindexed_path,
+            reindices_path,
+            fingerprints_path,
+            legacy_dump_path,
+            legacy_reindices_path,
+        )
+        self.connection.execute(
+            "ATTACH DATABASE ? AS old", (str(fingerprints_path),)
+        )
+        self.delta_path = delta_path
+        self.stats = {"add": 0, "change": 0, "remove": 0, "unchanged": 0}
+
+        delta_path.parent.mkdir(parents=True, exist_ok=True)
+        self._delta_obj = open(
+            get_tmp_path(delta_path), "w", encoding="utf-8"
+        )
+
+    def write_delta(self, op: str, key: str, line: Optional[str] = None):
+        delta = f'{{"op": "{op}", "key": {key}'
+        if line is not None:
+            delta += f', "entry": {line}'
+        self._delta_obj.write(delta + "}\n")
+        self.stats[op] += 1
+
+    def write_deltas(self):
+        """Compares the new entries with the old ones and writes the
+        delta file."""
+        self.connection.executescript(
+            """
+            CREATE TEMP TABLE unchanged AS
+            WITH
+                new AS (
+                    SELECT line, key, fingerprint, ROW_NUMBER() OVER (
+                        PARTITION BY key, fingerprint ORDER BY line
+                    ) AS rank FROM main.entries
+                ),
+                old AS (
+                    SELECT line, key, fingerprint, ROW_NUMBER() OVER (
+                        PARTITION BY key, fingerprint ORDER BY line
+                    ) AS rank FROM old.entries
+                )
+            SELECT new.line AS new_line, old.line AS old_line
+            FROM new JOIN old USING (key, fingerprint, rank);
+
+            CREATE TEMP TABLE new_unmatched AS
+            SELECT line, key, offset, ROW_NUMBER() OVER (
+                PARTITION BY key ORDER BY line
+            ) AS rank FROM main.entries
+            WHERE line NOT IN (SELECT new_line FROM unchanged);
+
+            CREATE TEMP TABLE old_unmatched AS
+            SELECT line, key, ROW_NUMBER() OVER (
+                PARTITION BY key ORDER BY line
+            ) AS rank FROM old.entries
+            WHERE line NOT IN (SELECT old_line FROM unchanged);
+
+            CREATE INDEX temp.new_unmatched_key ON new_unmatched (key, rank);
+            CREATE INDEX temp.old_unmatched_key ON old_unmatched (key, rank);
+            """
+        )
+        (self.stats["unchanged"],) = self.connection.execute(
+            "SELECT COUNT(*) FROM unchanged"
+        ).fetchone()
+
+        rows = self.connection.execute(
+            "SELECT new.key, new.offset, old.line IS NOT NULL "
+            "FROM new_unmatched AS new LEFT JOIN old_unmatched AS old "
+            "USING (key, rank) ORDER BY new.line"
+        )
+        with open(get_tmp_path(self.reindexed_path), "rb") as reindx_obj:
+            for key, offset, changed in rows:
+                reindx_obj.seek(offset)
+                line = reindx_obj.readline().decode("utf-8").rstrip("\n")
+                self.write_delta("change" if changed else "add", key, line)
+
+        # Old entries left unmatched are not in the new dump
+        rows = self.connection.execute(
+            "SELECT old.key "
+            "FROM old_unmatched AS old LEFT JOIN new_unmatched AS new "
+            "USING (key, rank) WHERE new.line IS NULL ORDER BY old.line"
+        )
+        for (key,) in rows:
+            self.write_delta("remove", key)
+
+        self.connection.executescript(
+            """
+            DROP TABLE temp.unchanged;
+            DROP TABLE temp.new_unmatched;
+            DROP TABLE temp.old_unmatched;
+            """
+        )
+
+    def close(self):
+        """Writes the delta file, then the outputs, and moves them into
+        place."""
+        self._reindx_obj.flush()
+        self.spill()
+        self.write_deltas()
+        self.connection.execute("DETACH DATABASE old")
+
+        self._delta_obj.close()
+        super().close()
+        os.replace(get_tmp_path(self.delta_path), self.delta_path)
+
+    def get_tmp_paths(self) -> List[Path]:
+        return super().get_tmp_paths() + [get_tmp_path(self.delta_path)]
+
+    def abort(self):
+        """Discards the temporary outputs, keeping the previous ones."""
+        self._delta_obj.close()
+        super().abort()
+
+
+def build_prefilter(langs: List[str]) -> Pattern[bytes]:
+    """Builds a regex matching the raw `lang_code` field of `langs`.
+
+    Only lines that match it are decoded. Translations and other nested
+    objects carry `lang_code` too, so a match is only a candidate and the
+    decoded entry is still checked.
+
+    Args:
+        langs (List[str]): Language codes to extract.
+
+    Returns:
+        Pattern[bytes]: Compiled prefilter regex.
+    """
+    codes = b"|".join(re.escape(lang.encode("utf-8")) for lang in langs)
+    return re.compile(rb'"lang_code":\s*"(?:' + codes + rb')"')
+
+
+def read_chunks(
+    wiki_path: Path, prefilter: Pattern[bytes], chunk_size: int
+) -> Iterator[List[bytes]]:
+    """Yields chunks of the raw dump lines that match `prefilter`.
+
+    Args:
+        wiki_path (Path): Path to the Wiktionary dump file.
+        prefilter (Pattern[bytes]): Regex that candidate lines match.
+        chunk_size (int): Number of candidate lines per chunk.
+
+    Yields:
+        List[bytes]: Raw candidate lines.
+    """
+    chunk: List[bytes] = []
+    with gzip.open(wiki_path, "rb") as wiki_obj:
+        for i, line in enumerate(wiki_obj):
+            if prefilter.search(line):
+                chunk.append(line)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+            if (i % 999) == 0:
+                print(f"Reading Line: {i}", end="\r")
+    if chunk:
+        yield chunk
+
+
+def process_chunk(lines: List[bytes], langs: List[str]) -> List[DumpEntry]:
+    """Decodes candidate lines and serializes the entries in `langs`.
+
+    Args:
+        lines (List[bytes]): Raw candidate lines.
+        langs (List[str]): Language codes to extract.
+
+    Returns:
+        List[DumpEntry]: The extracted entries.
+    """
+    entries = []
+    for line in lines:
+        line_obj = json.loads(line)
+        lang = line_obj.get("lang_code", "")
+        if lang in langs and line_obj.get("word"):
+            word = normalize_ar(line_obj["word"])
+            ar_dict = {k: v for k, v in line_obj.items() if k != "word"}
+            entry_line = json.dumps({word: ar_dict})
+            fingerprint = hashlib.blake2b(
+                entry_line.encode("utf-8"), digest_size=8
+            ).hexdigest()
+            entries.append(
+                DumpEntry(
+                    lang,
+                    word,
+                    line_obj.get("pos", ""),
+                    line_obj.get("etymology_number"),
+                    fingerprint,
+                    entry_line,
+                )
+            )
+    return entries
+
+
+def iter_entries(
+    wiki_path: Path,
+    langs: List[str],
+    processes: int = 1,
+    chunk_size: int = 2048,
+) -> Iterator[DumpEntry]:
+    """Yields the entries in `langs`, in the dump order.
+
+    With more than one process, the current process decompresses and
+    prefilters the dump while the workers decode the candidate chunks. At
+    most two chunks per worker are in flight, so memory stays bounded.
+
+    Args:
+        wiki_path (Path): Path to the Wiktionary dump file.
+        langs (List[str]): Language codes to extract.
+        processes (int, optional): Number of decoding processes. Defaults
+        to 1, which decodes in the current process.
+        chunk_size (int, optional): Number of candidate lines sent to a
+        worker at once. Defaults to 2048.
+
+    Yields:
+        DumpEntry: The extracted entries.
+    """
+    chunks = read_chunks(wiki_path, build_prefilter(langs), chunk_size)
+    if processes <= 1:
+        for chunk in chunks:
+            yield from process_chunk(chunk, langs)
+        return
+
+    with multiprocessing.Pool(processes) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * processes:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.append(pool.apply_async(process_chunk, (chunk, langs)))
+            if not pending:
+                return
+            yield from pending.popleft().get()
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Load Wikitionary Dump File and Reindex It"
@@ -24,15 +547,59 @@ if __name__ == "__main__":
     parser.add_argument(
         "-op",
         type=str,
-        default="../data/processed/wikidata/ar-wiktextract-data.json.gz",
-        help="Path To save the reindexed dump file.",
+        default="../data/processed/wikidata/{lang}-wiktextract-data.jsonl",
+        help="Path To save the reindexed dump file of each language, "
+        "where {lang} is replaced with the language code.",
     )
 
     parser.add_argument(
         "-ap",
         type=str,
-        default="../data/processed/wikidata/ar_reindex.json.gz",
-        help="Path To save the reindexed dump file.",
+        default="../data/processed/wikidata/{lang}_offsets.json.gz",
+        help="Path To save the words byte offsets index of each language, "
+        "where {lang} is replaced with the language code.",
+    )
+
+    parser.add_argument(
+        "-fp",
+        type=str,
+        default="../data/processed/wikidata/{lang}_fingerprints.sqlite",
+        help="Path To save the entries fingerprints database of each "
+        "language, where {lang} is replaced with the language code.",
+    )
+
+    parser.add_argument(
+        "-dp",
+        type=str,
+        default="../data/processed/wikidata/{lang}-delta.jsonl",
+        help="Path To save the added, changed and removed entries of each "
+        "language in incremental mode, where {lang} is replaced with the "
+        "language code.",
+    )
+
+    parser.add_argument(
+        "-gp",
+        type=str,
+        default="../data/processed/wikidata/{lang}-wiktextract-data.json.gz",
+        help="Path To save the gzipped reindexed dump file of each language "
+        "read by the notebooks, where {lang} is replaced with the language "
+        "code. Pass an empty string to skip it.",
+    )
+
+    parser.add_argument(
+        "-rp",
+        type=str,
+        default="../data/processed/wikidata/{lang}_reindex.json.gz",
+        help="Path To save the words line numbers index of each language "
+        "read by the notebooks, where {lang} is replaced with the language "
+        "code. Pass an empty string to skip it.",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Also compare the dump with the previous extraction and save "
+        "the added, changed and removed entries to the delta file.",
     )
 
     parser.add_argument(
@@ -42,50 +609,51 @@ if __name__ == "__main__":
         help="Languages to extract.",
     )
 
+    parser.add_argument(
+        "-j",
+        type=int,
+        default=1,
+        help="Number of processes decoding the dump lines.",
+    )
+
     args = parser.parse_args()
 
-    langs: List[str] = args.lg  # languages to be extracted
+    langs: List[str] = list(dict.fromkeys(args.lg))  # languages to extract
     wiki_path = Path(args.wp)  # Path to wiktionary dump file
-    wiki_reindexed_path = Path(args.op)  # Path to save reindexed wikitionary
-    wiki_reindices_path = Path(args.ap)  # Path to save the new re-indices
-
-    # TODO: What to do with the old files?
-    if wiki_reindexed_path.is_file():
-        pass
-    if wiki_reindices_path.is_file():
-        pass
+    templates = [args.op, args.ap, args.fp, args.dp, args.gp, args.rp]
+    if len(langs) > 1 and not all("{lang}" in t for t in templates if t):
+        parser.error("-op, -ap, -fp, -dp, -gp and -rp must contain {lang} "
+                     "to extract many languages")
 
-    # Process the data and gather it in a list
-    data_to_write = []
-    words_reindexed = defaultdict(list)
-    indx = 0
+    def create_writer(lang: str) -> ReindexedDumpWriter:
+        paths = [
+            Path(template.format(lang=lang)) if template else None
+            for template in templates
+        ]
+        if not args.incremental:
+            return ReindexedDumpWriter(*paths[:3], *paths[4:])
+        if not paths[2].is_file():
+            parser.error(f"No previous {lang} extraction to compare with; "
+                         "run without --incremental first")
+        return IncrementalDumpWriter(*paths)
 
-    # Load raw wikitionary dump file:
+    # Load raw wikitionary dump file once and stream each language to its
+    # own output files:
     # - Extract words belong to `langs`
     # - Reindexing `json` object to be keyed with the extracted words
-    # - Save the line number for easier acess in future for each word
+    # - Save the byte offset for easier acess in future for each word
     #   - Words can be repeated
-    with gzip.open(wiki_path, "rt", encoding="utf-8") as wiki_obj:
-        for i, line in enumerate(wiki_obj):
-            line_obj = json.loads(line)
-            if line_obj.get("lang_code", "") in langs and line_obj.get("word"):
-                word = line_obj["word"]
-                ar_dict = {k: v for k, v in line_obj.items() if k != "word"}
-                word = normalize_ar(word)
-                words_reindexed[word].append(indx)
-                indx += 1
-
-                # Serialize the new dictionary structure and add it to the list
-                data_to_write.append(json.dumps({word: ar_dict}))
-            if (i % 999) == 0:
-                print(f"Reading Line: {i}", end="\r")
-
-    # Write the list to the GZIP file
-    with gzip.open(wiki_reindexed_path, "at", encoding="utf-8") as reindx_obj:
-        for entry in tqdm(data_to_write, desc="Write Incdexed Files"):
-            reindx_obj.write(entry + "\n")
+    # The outputs replace the old files only once the whole dump is read.
+    with ExitStack() as stack:
+        writers: Dict[str, ReindexedDumpWriter] = {
+            lang: stack.enter_context(create_writer(lang)) for lang in langs
+        }
+        for entry in iter_entries(wiki_path, langs, args.j):
+            writers[entry.lang].add(entry)
 
-    # Serialize and write the reindex data
-    with gzip.open(wiki_reindices_path, "wt", encoding="utf-8") as indexs_obj:
-        json_reindex = json.dumps(words_reindexed)
-        indexs_obj.write(json_reindex)
+    print()
+    for lang, writer in writers.items():
+        path = writer.reindexed_path
+        print(f"Extracted {writer.indx} {lang} entries to {path}")
+        if args.incremental:
+            print(", ".join(f"{op}: {n}" for op, n in writer.stats.items()))
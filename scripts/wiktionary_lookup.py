@@ -0,0 +1,179 @@
+import argparse
+import gzip
+import json
+import mmap
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Union
+
+from ar_utils import normalize_ar
+
+
+class WiktionaryLookup:
+    """Random access to the reindexed Wiktionary written by
+    `preprocess_wkitionary_dump.py`.
+
+    The JSONL file is memory-mapped and the byte offsets index is loaded
+    once, so getting the entries of a word costs one seek per entry
+    instead of a scan of the whole file. Decoded entries are kept in an
+    LRU cache shared by `lookup` and `lookup_many`; they are returned as
+    is, so they should not be modified by the caller.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: Union[str, Path],
+        offsets_path: Union[str, Path],
+        cache_size: int = 65536,
+    ):
+        """
+        Args:
+            jsonl_path (Union[str, Path]): Path to the reindexed JSONL file.
+            offsets_path (Union[str, Path]): Path to the words byte offsets
+            index.
+            cache_size (int, optional): Maximum number of decoded entries
+            kept in memory. Defaults to 65536.
+        """
+        self.cache_size = cache_size
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+
+        with gzip.open(offsets_path, "rt", encoding="utf-8") as f:
+            self.words_offsets: Dict[str, List[int]] = json.load(f)
+
+        self._file = open(jsonl_path, "rb")
+        self._mmap = None
+        if Path(jsonl_path).stat().st_size:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+    def read_entry(self, offset: int) -> Dict[str, Any]:
+        """Decodes the entry line starting at `offset`.
+
+        Args:
+            offset (int): Byte offset of the line in the JSONL file.
+
+        Returns:
+            Dict[str, Any]: The entry keyed with its word.
+        """
+        end = self._mmap.find(b"\n", offset)
+        if end == -1:
+            end = len(self._mmap)
+        return json.loads(self._mmap[offset:end])
+
+    def _get_entry(self, offset: int) -> Dict[str, Any]:
+        entry = self._entries.get(offset)
+        if entry is not None:
+            self._entries.move_to_end(offset)
+            return entry
+
+        entry = self.read_entry(offset)
+        self._entries[offset] = entry
+        if len(self._entries) > self.cache_size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def lookup(self, word: str) -> List[Dict[str, Any]]:
+        """Gets the Wiktionary entries of a word.
+
+        Args:
+            word (str): Word to look up, normalized with `normalize_ar`.
+
+        Returns:
+            List[Dict[str, Any]]: The entries of the word, each keyed with
+            the word, in the dump order. Empty if the word is not found.
+        """
+        offsets = self.words_offsets.get(normalize_ar(word), [])
+        return [self._get_entry(offset) for offset in offsets]
+
+    def lookup_many(
+        self, words: Iterable[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Gets the Wiktionary entries of many words at once.
+
+        The words are normalized with `normalize_ar` and the offsets of all
+        their entries are read in increasing order, so the file is read
+        sequentially and an entry shared by several words is decoded once.
+
+        Args:
+            words (Iterable[str]): Words to look up.
+
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: The entries of each distinct
+            word, as returned by `lookup`.
+        """
+        words_keys = {word: normalize_ar(word) for word in words}
+        offsets = sorted(
+            {
+                offset
+                for key in set(words_keys.values())
+                for offset in self.words_offsets.get(key, [])
+            }
+        )
+        entries = {offset: self._get_entry(offset) for offset in offsets}
+
+        return {
+            word: [
+                entries[offset] for offset in self.words_offsets.get(key, [])
+            ]
+            for word, key in words_keys.items()
+        }
+
+    def __contains__(self, word: str) -> bool:
+        return normalize_ar(word) in self.words_offsets
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self) -> "WiktionaryLookup":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Look Up Words in the Reindexed Wikitionary"
+    )
+
+    parser.add_argument(
+        "words",
+        nargs="+",
+        help="Words to look up.",
+    )
+
+    parser.add_argument(
+        "-op",
+        type=str,
+        default="../data/processed/wikidata/{lang}-wiktextract-data.jsonl",
+        help="Path for the reindexed dump file, where {lang} is replaced "
+        "with the language code.",
+    )
+
+    parser.add_argument(
+        "-ap",
+        type=str,
+        default="../data/processed/wikidata/{lang}_offsets.json.gz",
+        help="Path for the words byte offsets index, where {lang} is "
+        "replaced with the language code.",
+    )
+
+    parser.add_argument(
+        "-lg",
+        type=str,
+        default="ar",
+        help="Language of the words.",
+    )
+
+    args = parser.parse_args()
+
+    jsonl_path = args.op.format(lang=args.lg)
+    offsets_path = args.ap.format(lang=args.lg)
+    with WiktionaryLookup(jsonl_path, offsets_path) as wiktionary:
+        for entries in wiktionary.lookup_many(args.words).values():
+            for entry in entries:
+                print(json.dumps(entry, ensure_ascii=False))
@@ -0,0 +1,303 @@
+"""
+Benchmarks of the transphonator pipeline stages.
+
+Each stage is timed separately over a words corpus: dictionary loading,
+phoneme retrieval (`get_phonemes`), phoneme mapping (`get_equivalent`), rules
+(`apply`) and end-to-end transphonation (`transphonate` and
+`transphonate_batch`). The results can be saved as a baseline and compared
+with later runs.
+
+Example:
+    python benchmark_transphonator.py <data_dir> -c synthetic GN SN LN \\
+        --save-baseline bench_baseline.json
+    python benchmark_transphonator.py <data_dir> -c synthetic GN SN LN \\
+        --baseline bench_baseline.json
+"""
+
+import argparse
+import csv
+import json
+import platform
+import random
+import re
+import resource
+import string
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+from transphonator.phoneme.cmu_retriever import CMURetriever
+from transphonator.pipeline.transliterator import TranslitPipeline
+from transphonator.translit_maps.arabic_map import TranslitMapAra
+from transphonator.translit_rules.arabic_rules import TranslitRuleAra
+from transphonator.utils.paths import get_data_dir
+
+PROPER_NOUNS_DIR = "../data/Aarne/proper_nouns"
+PROPER_NOUNS_CORPORA = {
+    "GN": "GN.csv",
+    "SN": "SN.csv",
+    "LN": "LN_new/LN.csv",
+}
+# WordNet entries are "<words>_<optional-number>_<type>", e.g. albany_1_LN
+WORDNET_ENTRY_SUFFIX_REGEX = re.compile(r"(?:_\d+)?_[A-Z]+$")
+
+
+def load_proper_nouns(csv_path: Path) -> List[str]:
+    """Get the English words of the WordNet entries of a proper nouns CSV."""
+    words = []
+    with open(csv_path, encoding="utf-8", newline="") as file_obj:
+        for row in csv.DictReader(file_obj, delimiter="\t"):
+            entry = WORDNET_ENTRY_SUFFIX_REGEX.sub("", row["wordnet_entry"])
+            words.extend(word for word in entry.split("_") if word)
+    return words
+
+
+def make_synthetic_corpus(
+    vocabulary: List[str], size: int, oov_ratio: float, seed: int
+) -> List[str]:
+    """Sample words from the vocabulary, mixed with random OOV strings."""
+    rng = random.Random(seed)
+    vocabulary = sorted(vocabulary)
+    words = []
+    for _ in range(size):
+        if rng.random() < oov_ratio:
+            length = rng.randint(3, 12)
+            letters = rng.choices(string.ascii_lowercase, k=length)
+            words.append("".join(letters))
+        else:
+            words.append(rng.choice(vocabulary))
+    return words
+
+
+def time_calls(func: Callable, items: Iterable) -> List[int]:
+    """Time `func` on each item, in nanoseconds."""
+    latencies = []
+    perf_counter_ns = time.perf_counter_ns
+    for item in items:
+        start = perf_counter_ns()
+        func(item)
+        latencies.append(perf_counter_ns() - start)
+    return latencies
+
+
+def summarize(latencies: List[int]) -> Dict[str, float]:
+    """Get the throughput and p50/p99 latencies (µs) of timed calls."""
+    if not latencies:
+        return {"count": 0}
+    total = sum(latencies)
+    latencies = sorted(latencies)
+    last_idx = len(latencies) - 1
+    return {
+        "count": len(latencies),
+        "items_per_sec": len(latencies) / (total / 1e9) if total else 0.0,
+        "p50_us": latencies[round(0.5 * last_idx)] / 1000,
+        "p99_us": latencies[round(0.99 * last_idx)] / 1000,
+    }
+
+
+def bench_load(cmu_dict_path, fallback_dict_path, repeat) -> Dict[str, dict]:
+    """Time the dictionary loading, from text and from the cache."""
+    results = {}
+    for name, use_cache in (("load_text", False), ("load_cache", True)):
+        # First call writes the cache, it is not timed
+        CMURetriever(cmu_dict_path, fallback_dict_path, use_cache=use_cache)
+        latencies = time_calls(
+            lambda _: CMURetriever(
+                cmu_dict_path, fallback_dict_path, use_cache=use_cache
+            ),
+            range(repeat),
+        )
+        results[name] = summarize(latencies)
+    return results
+
+
+def bench_corpus(
+    pipeline: TranslitPipeline, words: List[str], repeat: int
+) -> Dict[str, dict]:
+    """Time each stage of the pipeline over a words corpus."""
+    retriever = pipeline.phoneme_retriever
+    translit_map = pipeline.transliteration_map
+    rules = pipeline.transliteration_rules
+
+    phonemes_list = [p for p in map(retriever.get_phonemes, words) if p]
+    phonemes = [p for word_phonemes in phonemes_list for p in word_phonemes]
+    mapped = translit_map.get_equivalents_batch(phonemes_list)
+
+    stages = {
+        "get_phonemes": (retriever.get_phonemes, words),
+        "get_equivalent": (translit_map.get_equivalent, phonemes),
+        "apply": (rules.apply, mapped),
+        "transphonate": (pipeline.transphonate, words),
+    }
+    results = {}
+    for name, (func, items) in stages.items():
+        latencies = []
+        for _ in range(repeat):
+            latencies.extend(time_calls(func, items))
+        results[name] = summarize(latencies)
+
+    # Batch API: latency is per batch, throughput is per word
+    batch_latencies = time_calls(
+        pipeline.transphonate_batch, [words] * repeat
+    )
+    results["transphonate_batch"] = summarize(batch_latencies)
+    total_sec = sum(batch_latencies) / 1e9
+    results["transphonate_batch"]["items_per_sec"] = (
+        len(words) * repeat / total_sec if total_sec else 0.0
+    )
+    results["none_ratio"] = {
+        "ratio": sum(p is None for p in pipeline.transphonate_batch(words))
+        / max(len(words), 1)
+    }
+    return results
+
+
+def compare(results: dict, baseline: dict):
+    """Print the speedup of each stage relative to the baseline."""
+    print(f"\n{'corpus':<12}{'stage':<22}{'speedup':>9}{'p50':>9}{'p99':>9}")
+    for corpus, stages in results["corpora"].items():
+        for stage, stats in stages.items():
+            base = baseline.get("corpora", {}).get(corpus, {}).get(stage)
+            if not base or "items_per_sec" not in stats:
+                continue
+            ratios = [
+                stats["items_per_sec"] / base["items_per_sec"],
+                base["p50_us"] / stats["p50_us"] if stats["p50_us"] else 0,
+                base["p99_us"] / stats["p99_us"] if stats["p99_us"] else 0,
+            ]
+            print(
+                f"{corpus:<12}{stage:<22}"
+                + "".join(f"{ratio:>8.2f}x" for ratio in ratios)
+            )
+    print(
+        f"\npeak RSS: {results['peak_rss_mb']:.1f} MB "
+        f"(baseline {baseline.get('peak_rss_mb', 0):.1f} MB)"
+    )
+
+
+def print_results(results: dict):
+    print(
+        f"{'corpus':<12}{'stage':<22}{'items/s':>12}{'p50 us':>10}"
+        f"{'p99 us':>10}"
+    )
+    for corpus, stages in results["corpora"].items():
+        for stage, stats in stages.items():
+            if "items_per_sec" not in stats:
+                continue
+            print(
+                f"{corpus:<12}{stage:<22}{stats['items_per_sec']:>12.0f}"
+                f"{stats['p50_us']:>10.2f}{stats['p99_us']:>10.2f}"
+            )
+    print(f"peak RSS: {results['peak_rss_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the transphonator pipeline stages."
+    )
+    parser.add_argument(
+        "data_dir",
+        type=str,
+        help="The base data absolute directory.",
+    )
+    parser.add_argument(
+        "-c",
+        "--corpora",
+        nargs="+",
+        default=["synthetic", "GN", "SN", "LN"],
+        help=(
+            "Corpora to benchmark: synthetic, GN, SN, LN or paths to text "
+            "files with one word per line."
+        ),
+    )
+    parser.add_argument(
+        "--pn-dir",
+        type=str,
+        default=PROPER_NOUNS_DIR,
+        help="Directory of the GN/SN/LN proper nouns CSV files.",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=20000,
+        help="Number of words of the synthetic corpus.",
+    )
+    parser.add_argument(
+        "--oov-ratio",
+        type=float,
+        default=0.1,
+        help="Ratio of random out-of-vocabulary words in synthetic corpus.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed of the synthetic corpus.",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="Number of times each stage is run.",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        type=str,
+        default=None,
+        help="Path to save the results as a baseline.",
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="Path of a saved baseline to compare the results with.",
+    )
+    args = parser.parse_args()
+
+    cmu_dict_path, fallback_dict_path = get_data_dir(args.data_dir)
+    results = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "corpora": {"dictionary": bench_load(
+            cmu_dict_path, fallback_dict_path, args.repeat
+        )},
+    }
+
+    retriever = CMURetriever(cmu_dict_path, fallback_dict_path)
+    pipeline = TranslitPipeline(retriever, TranslitMapAra(), TranslitRuleAra())
+
+    for corpus in args.corpora:
+        if corpus == "synthetic":
+            words = make_synthetic_corpus(
+                list(retriever.english_word_to_phoneme),
+                args.size,
+                args.oov_ratio,
+                args.seed,
+            )
+        elif corpus in PROPER_NOUNS_CORPORA:
+            words = load_proper_nouns(
+                Path(args.pn_dir) / PROPER_NOUNS_CORPORA[corpus]
+            )
+        else:
+            with open(corpus, encoding="utf-8") as file_obj:
+                words = [line.strip() for line in file_obj if line.strip()]
+        results["corpora"][corpus] = bench_corpus(
+            pipeline, words, args.repeat
+        )
+
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak_rss /= 1024
+    results["peak_rss_mb"] = peak_rss / 1024
+
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as file_obj:
+            json.dump(results, file_obj, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file_obj:
+            compare(results, json.load(file_obj))
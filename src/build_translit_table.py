@@ -0,0 +1,58 @@
+"""
+Precompute the Arabic transliterations of the whole CMU and fallback
+vocabulary into a memory-mapped table used by `PrecomputedTranslitPipeline`.
+
+Example:
+    python build_translit_table.py <data_dir>
+"""
+
+import argparse
+import os
+
+from transphonator.phoneme.cmu_retriever import CMURetriever
+from transphonator.pipeline.precomputed_transliterator import (
+    TABLE_SUFFIX,
+    build_translit_table,
+)
+from transphonator.pipeline.transliterator import TranslitPipeline
+from transphonator.translit_maps.arabic_map import TranslitMapAra
+from transphonator.translit_rules.arabic_rules import TranslitRuleAra
+from transphonator.utils.paths import get_data_dir
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(
+        description="Precompute the transliterations of the CMU vocabulary."
+    )
+    parser.add_argument(
+        "data_dir",
+        type=str,
+        help="The base data absolute directory.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="Path of the table. Defaults to the CMU dictionary path with a "
+        f"`{TABLE_SUFFIX}` suffix.",
+    )
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.data_dir):
+        print(f"Error: {args.data_dir} is not a valid directory")
+        exit(1)
+
+    cmu_dict_path, fallback_dict_path = get_data_dir(args.data_dir)
+    table_path = args.output or cmu_dict_path + TABLE_SUFFIX
+
+    retriever = CMURetriever(cmu_dict_path, fallback_dict_path)
+    transliteration_pipline_ar = TranslitPipeline(
+        retriever, TranslitMapAra(), TranslitRuleAra()
+    )
+
+    words = list(retriever.english_word_to_phoneme) + list(
+        retriever.fallback_dict
+    )
+    build_translit_table(table_path, transliteration_pipline_ar, words)
+    print(f"Wrote {table_path}")
@@ -1,29 +1,39 @@
+import sys
+
 from transphonator.phoneme.base_retriever import BasePhonemeRetriever
+from transphonator.phoneme.cascading_retriever import CascadingRetriever
 from transphonator.phoneme.cmu_retriever import CMURetriever
 from transphonator.phoneme.g2p_retriever import G2pRetriever
+from transphonator.pipeline.parallel_transliterator import (
+    ParallelTranslitPipeline,
+)
+from transphonator.pipeline.phrase_transliterator import PhraseTranslitPipeline
 from transphonator.pipeline.transliterator import TranslitPipeline
 from transphonator.translit_maps.arabic_map import TranslitMapAra
 from transphonator.translit_rules.arabic_rules import TranslitRuleAra
 from transphonator.utils.paths import get_data_dir, process_args
+from transphonator.utils.streaming import read_words, stream_transphonate
 
 
 def create_phoneme_retriever_ar(
     cmu_dict_path,
     fallback_dict_path=None,
 ) -> BasePhonemeRetriever:
+    cmu_retriever = CMURetriever(
+        cmu_dict_path, fallback_dict_path=fallback_dict_path
+    )
     try:
-        return G2pRetriever()
+        g2p_retriever = G2pRetriever()
     except ImportError:
-        return CMURetriever(
-            cmu_dict_path, fallback_dict_path=fallback_dict_path
-        )
+        g2p_retriever = None
+    return CascadingRetriever(cmu_retriever, g2p_retriever)
 
 
 if __name__ == "__main__":
 
-    # Get data directory from arguments
-    data_dir = process_args()
-    cmu_dict_path, fallback_dict_path = get_data_dir(data_dir)
+    # Get data directory and streaming options from arguments
+    args = process_args()
+    cmu_dict_path, fallback_dict_path = get_data_dir(args.data_dir)
 
     # Step 1: Create Phoneme Retriever.
     phoneme_retriever_ar = create_phoneme_retriever_ar(
@@ -41,7 +51,42 @@ if __name__ == "__main__":
         phoneme_retriever_ar, transliteration_map_ar, transliteration_rules_ar
     )
 
+    if args.phrases:
+        transliteration_pipline_ar = PhraseTranslitPipeline(
+            transliteration_pipline_ar
+        )
+
     # Step 5: Run the pipeline.
-    words = "Magdalena kristersson Naruhito Ulf this is".split()
-    for word in words:
-        print(word, transliteration_pipline_ar.transphonate(word))
+    if args.input:
+        # Stream the input words and write the results incrementally
+        if args.jobs > 1:
+            transliteration_pipline_ar = ParallelTranslitPipeline(
+                transliteration_pipline_ar,
+                processes=args.jobs,
+                chunk_size=args.chunk_size,
+            )
+        words = read_words(args.input, column=args.column)
+        if args.output == "-":
+            stream_transphonate(
+                transliteration_pipline_ar,
+                words,
+                sys.stdout,
+                args.format,
+                args.chunk_size,
+            )
+        else:
+            with open(args.output, "w", encoding="utf-8") as output_obj:
+                stream_transphonate(
+                    transliteration_pipline_ar,
+                    words,
+                    output_obj,
+                    args.format,
+                    args.chunk_size,
+                )
+        if args.jobs > 1:
+            transliteration_pipline_ar.close()
+    else:
+        words = "Magdalena kristersson Naruhito Ulf this is".split()
+        transliterations = transliteration_pipline_ar.transphonate_batch(words)
+        for word, transliteration in zip(words, transliterations):
+            print(word, transliteration)
@@ -0,0 +1,29 @@
+import asyncio
+
+from run_transphonator import create_phoneme_retriever_ar
+from transphonator.pipeline.transliterator import TranslitPipeline
+from transphonator.service.server import TranslitServer
+from transphonator.translit_maps.arabic_map import TranslitMapAra
+from transphonator.translit_rules.arabic_rules import TranslitRuleAra
+from transphonator.utils.paths import get_data_dir, process_server_args
+
+if __name__ == "__main__":
+
+    # Get data directory and server options from arguments
+    args = process_server_args()
+    cmu_dict_path, fallback_dict_path = get_data_dir(args.data_dir)
+
+    # Load the pipeline once for all requests.
+    transliteration_pipline_ar = TranslitPipeline(
+        create_phoneme_retriever_ar(cmu_dict_path, fallback_dict_path),
+        TranslitMapAra(),
+        TranslitRuleAra(),
+    )
+
+    server = TranslitServer(
+        transliteration_pipline_ar,
+        max_batch_size=args.max_batch_size,
+        max_delay=args.max_delay / 1000,
+    )
+    print(f"Serving on http://{args.host}:{args.port}")
+    asyncio.run(server.serve(args.host, args.port))
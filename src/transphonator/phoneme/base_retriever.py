@@ -7,3 +7,19 @@ class BasePhonemeRetriever(ABC):
     def get_phonemes(self, word: str) -> Union[List[str], None]:
         """Retrieve phonemes for a given word."""
         pass
+
+    def fingerprint(self) -> str:
+        """Version of the retriever data, which changes when the data the
+        phonemes are retrieved from changes."""
+        return type(self).__name__
+
+    def sources_stamps(self) -> List[List[int]]:
+        """Stamps of the dictionary files the phonemes are retrieved from,
+        as returned by `get_sources_stamps`. Empty if there are none."""
+        return []
+
+    def get_phonemes_batch(
+        self, words: List[str]
+    ) -> List[Union[List[str], None]]:
+        """Retrieve phonemes for a list of words, in the same order."""
+        return [self.get_phonemes(word) for word in words]
@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from typing import Dict, List, Optional, Union
+
+from transphonator.phoneme.base_retriever import BasePhonemeRetriever
+from transphonator.phoneme.cmu_retriever import CMURetriever
+from transphonator.utils.cache import get_fingerprint
+
+
+class CascadingRetriever(BasePhonemeRetriever):
+    def __init__(
+        self,
+        lexicon_retriever: BasePhonemeRetriever,
+        g2p_retriever: Optional[BasePhonemeRetriever] = None,
+        cache_size: int = 65536,
+    ):
+        """Initialize the CascadingRetriever, which looks words up in the
+        lexicons first and only runs the (costly) g2p model on the words that
+        are not found.
+
+        With a `CMURetriever`, the CMU dictionary and then the fallback
+        dictionary are tried as separate sources. Any other retriever (e.g.
+        `LexiconRetriever`) is tried as a single `lexicon` source.
+
+        Args:
+            lexicon_retriever (BasePhonemeRetriever): The lexicon retriever to
+            try first.
+            g2p_retriever (BasePhonemeRetriever, optional): The retriever for
+            the words that are not in the lexicons. Defaults to None.
+            cache_size (int, optional): Maximum number of g2p predictions to
+            memoize. Defaults to 65536.
+        """
+        self.lexicon_retriever = lexicon_retriever
+        if isinstance(lexicon_retriever, CMURetriever):
+            self.sources = [
+                ("cmu", lexicon_retriever.english_word_to_phoneme.get),
+                ("fallback", lexicon_retriever.fallback_dict.get),
+            ]
+        else:
+            self.sources = [("lexicon", lexicon_retriever.get_phonemes)]
+        self.g2p_retriever = g2p_retriever
+        self.cache_size = cache_size
+
+        # LRU of g2p predictions: lower-cased word -> phonemes
+        self._g2p_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+
+        names = [name for name, _ in self.sources]
+        if g2p_retriever is not None:
+            names += ["g2p", "g2p_cache"]
+        self.stats: Dict[str, Dict[str, int]] = {
+            name: {"hits": 0, "misses": 0} for name in names
+        }
+
+    def fingerprint(self) -> str:
+        """Hash of the versions of the lexicon and g2p retrievers."""
+        return get_fingerprint(
+            [
+                type(self).__name__,
+                self.lexicon_retriever.fingerprint(),
+                self.g2p_retriever and self.g2p_retriever.fingerprint(),
+            ]
+        )
+
+    def sources_stamps(self) -> List[List[int]]:
+        """Stamps of the dictionaries of the lexicon retriever."""
+        return self.lexicon_retriever.sources_stamps()
+
+    def _lookup_lexicons(self, word: str) -> Union[List[str], None]:
+        for name, lookup in self.sources:
+            phonemes = lookup(word)
+            if phonemes is not None:
+                self.stats[name]["hits"] += 1
+                return phonemes
+            self.stats[name]["misses"] += 1
+        return None
+
+    def _lookup_g2p_cache(self, word: str) -> Union[List[str], None]:
+        phonemes = self._g2p_cache.get(word)
+        if phonemes is None:
+            self.stats["g2p_cache"]["misses"] += 1
+        else:
+            self.stats["g2p_cache"]["hits"] += 1
+            self._g2p_cache.move_to_end(word)
+        return phonemes
+
+    def _add_g2p_prediction(self, word: str, phonemes: List[str]):
+        self.stats["g2p"]["hits" if phonemes else "misses"] += 1
+        self._g2p_cache[word] = phonemes
+        if len(self._g2p_cache) > self.cache_size:
+            self._g2p_cache.popitem(last=False)
+
+    def get_phonemes(self, word: str) -> Union[List[str], None]:
+        """Retrieve the phonemes for a given word from the first source that
+        has it.
+
+        Args:
+            word (str): The word for which to retrieve the phonemes.
+
+        Returns:
+            list: A list of phonemes corresponding to the input word.
+                  If the word is not found in the lexicons and there is no g2p
+                  retriever, None is returned.
+        """
+        word = word.lower()
+        phonemes = self._lookup_lexicons(word)
+        if phonemes is not None or self.g2p_retriever is None:
+            return phonemes
+
+        phonemes = self._lookup_g2p_cache(word)
+        if phonemes is None:
+            phonemes = self.g2p_retriever.get_phonemes(word)
+            self._add_g2p_prediction(word, phonemes)
+        return phonemes
+
+    def get_phonemes_batch(
+        self, words: List[str]
+    ) -> List[Union[List[str], None]]:
+        """Retrieve the phonemes for a list of words. The words that are not
+        found in the lexicons nor in the g2p cache are sent to the g2p
+        retriever in one batch.
+        """
+        words = [word.lower() for word in words]
+        found = {}
+        oov_words = []
+        for word in dict.fromkeys(words):
+            phonemes = self._lookup_lexicons(word)
+            if phonemes is None and self.g2p_retriever is not None:
+                phonemes = self._lookup_g2p_cache(word)
+                if phonemes is None:
+                    oov_words.append(word)
+                    continue
+            found[word] = phonemes
+
+        if oov_words:
+            predictions = self.g2p_retriever.get_phonemes_batch(oov_words)
+            for word, phonemes in zip(oov_words, predictions):
+                self._add_g2p_prediction(word, phonemes)
+                found[word] = phonemes
+
+        return [found[word] for word in words]
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Get the hit/miss counters of each source and of the g2p cache."""
+        return {name: dict(counters) for name, counters in self.stats.items()}
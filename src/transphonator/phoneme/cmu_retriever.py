@@ -7,24 +7,55 @@ import re
 from typing import List, Union
 
 from transphonator.phoneme.base_retriever import BasePhonemeRetriever
+from transphonator.utils.cache import (
+    get_fingerprint,
+    get_sources_stamps,
+    load_cached,
+)
 
 
 class CMURetriever(BasePhonemeRetriever):
-    def __init__(self, cmu_dict_path, fallback_dict_path=None):
+    def __init__(
+        self, cmu_dict_path, fallback_dict_path=None, use_cache=True
+    ):
         """Initialize the CMURetriever with an optional fallback dictionary.
 
         Args:
+            cmu_dict_path (str): Path to the CMU Pronouncing Dictionary file.
             fallback_dict_path (str, optional): Path to a custom fallback
             dictionary file. If provided, this file will be used to supplement
             the CMU Pronouncing Dictionary for word-to-phoneme mapping.
             Defaults to None.
+            use_cache (bool, optional): Load the dictionaries from compiled
+            cache files written next to them, rebuilding the caches when the
+            dictionary files change. Defaults to True.
         """
 
+        self.use_cache = use_cache
+        self.cmu_dict_path = cmu_dict_path
+        self.fallback_dict_path = fallback_dict_path
         self.english_word_to_phoneme = self.load_cmudict(cmu_dict_path)
         self.fallback_dict = self.load_fallback_dict(fallback_dict_path)
 
+    def fingerprint(self) -> str:
+        """Hash of the stamps of the dictionary files."""
+        return get_fingerprint([type(self).__name__, self.sources_stamps()])
+
+    def sources_stamps(self) -> List[List[int]]:
+        """Stamps of the CMU and fallback dictionary files."""
+        return get_sources_stamps(
+            [self.cmu_dict_path, self.fallback_dict_path]
+        )
+
     def load_cmudict(self, cmu_dict_path):
         """Load the CMU dictionary"""
+        if self.use_cache:
+            return load_cached(cmu_dict_path, self.parse_cmudict)
+        return self.parse_cmudict(cmu_dict_path)
+
+    @staticmethod
+    def parse_cmudict(cmu_dict_path):
+        """Parse the CMU dictionary text file"""
         try:
             with open(
                 file=cmu_dict_path,
@@ -49,6 +80,18 @@ class CMURetriever(BasePhonemeRetriever):
 
     def load_fallback_dict(self, fallback_dict_path):
         """Load the fallback dictionary from a user-provided file."""
+        try:
+            if self.use_cache:
+                return load_cached(
+                    fallback_dict_path, self.parse_fallback_dict
+                )
+            return self.parse_fallback_dict(fallback_dict_path)
+        except Exception:
+            return {}
+
+    @staticmethod
+    def parse_fallback_dict(fallback_dict_path):
+        """Parse the fallback dictionary text file."""
         fallback_dict = {}
         try:
             with open(fallback_dict_path, "r", encoding="utf-8") as f:
@@ -1,16 +1,89 @@
 import re
-from typing import List, Union
+import unicodedata
+from typing import Dict, List, Union
 
 from transphonator.phoneme.base_retriever import BasePhonemeRetriever
 
+PHONEME_REGEX = re.compile(r'[A-Z]+[\d]?')
+# Words made of letters only go through `g2p_en` as a single token
+WORD_REGEX = re.compile(r'[a-z]+')
+
 
 class G2pRetriever(BasePhonemeRetriever):
-    def __init__(self):
+    def __init__(self, batch_size: int = 256):
         """Initialize the G2pRetriever, which uses the `g2p_en` library to
         convert English words into their corresponding ARPAbet phonemes.
+
+        Args:
+            batch_size (int, optional): Maximum number of out-of-vocabulary
+            words decoded together by `get_phonemes_batch`. Defaults to 256.
         """
         from g2p_en import G2p
         self.g2p = G2p()
+        self.batch_size = batch_size
+
+    def _filter_phonemes(self, phonemes: List[str]) -> List[str]:
+        return [p for p in phonemes if PHONEME_REGEX.match(p)]
+
+    def _normalize_word(self, word: str) -> str:
+        """Strip accents and lower-case a word the way `g2p_en` does."""
+        return "".join(
+            char
+            for char in unicodedata.normalize("NFD", word)
+            if unicodedata.category(char) != "Mn"
+        ).lower()
+
+    def _predict_batch(self, words: List[str]) -> List[List[str]]:
+        """Run the `g2p_en` seq2seq model on a batch of words.
+
+        This is the batched version of `G2p.predict`: the encoder runs over
+        the padded words and each word keeps the hidden state of its own last
+        step, then greedy decoding stops per word at the end-of-sequence
+        token.
+        """
+        import numpy as np
+
+        g2p = self.g2p
+        lengths = np.array([len(word) + 1 for word in words])  # + "</s>"
+        unk_idx = g2p.g2idx["<unk>"]
+        graphemes_idxs = np.zeros((len(words), lengths.max()), np.int64)
+        for i, word in enumerate(words):
+            graphemes_idxs[i, :lengths[i]] = [
+                g2p.g2idx.get(char, unk_idx) for char in list(word) + ["</s>"]
+            ]
+
+        # encoder
+        enc = np.take(g2p.enc_emb, graphemes_idxs, axis=0)
+        h = np.zeros((len(words), g2p.enc_w_hh.shape[-1]), np.float32)
+        last_hidden = np.zeros_like(h)
+        for t in range(lengths.max()):
+            h = g2p.grucell(
+                enc[:, t, :], h, g2p.enc_w_ih, g2p.enc_w_hh, g2p.enc_b_ih,
+                g2p.enc_b_hh,
+            )
+            ended = lengths == t + 1
+            last_hidden[ended] = h[ended]
+
+        # decoder: only the words that did not emit "</s>" are kept running
+        active = np.arange(len(words))
+        dec = np.take(g2p.dec_emb, np.full(len(words), 2), axis=0)  # 2: <s>
+        h = last_hidden
+        preds: List[List[int]] = [[] for _ in words]
+        for _ in range(20):
+            h = g2p.grucell(
+                dec, h, g2p.dec_w_ih, g2p.dec_w_hh, g2p.dec_b_ih, g2p.dec_b_hh
+            )
+            logits = np.matmul(h, g2p.fc_w.T) + g2p.fc_b
+            pred = logits.argmax(axis=-1)
+            running = pred != 3  # 3: </s>
+            for word_idx, pred_idx in zip(active[running], pred[running]):
+                preds[word_idx].append(pred_idx)
+            if not running.any():
+                break
+            active, h, pred = active[running], h[running], pred[running]
+            dec = np.take(g2p.dec_emb, pred, axis=0)
+
+        return [[g2p.idx2p.get(idx, "<unk>") for idx in p] for p in preds]
 
     def get_phonemes(self, word: str) -> Union[List[str], None]:
         """Retrieve the phonemes for a given word using the `g2p_en` library.
@@ -32,5 +105,49 @@ class G2pRetriever(BasePhonemeRetriever):
             # Returns an empty list if the word cannot be converted
             ````
         """
-        phonemes = self.g2p(word)
-        return [p for p in phonemes if re.match(r'[A-Z]+[\d]?', p)]
+        return self.get_phonemes_batch([word])[0]
+
+    def get_phonemes_batch(
+        self, words: List[str]
+    ) -> List[Union[List[str], None]]:
+        """Retrieve the phonemes for a list of words using the `g2p_en`
+        model in batches.
+
+        Isolated words made of letters skip the `g2p_en` tokenizer and POS
+        tagger: they are looked up in the `g2p_en` CMU dictionary, and the
+        out-of-vocabulary ones are decoded together, `batch_size` words at a
+        time. Other words (homographs, numbers, punctuation) go through the
+        full `g2p_en` pipeline.
+
+        Args:
+            words (List[str]): The English words for which to retrieve
+            phonemes.
+
+        Returns:
+            List[Union[List[str], None]]: The phonemes of each word, in order.
+        """
+        g2p = self.g2p
+        results: List[Union[List[str], None]] = [None] * len(words)
+        oov_words: Dict[str, List[int]] = {}
+        for i, word in enumerate(words):
+            normalized_word = self._normalize_word(word)
+            if (
+                not WORD_REGEX.fullmatch(normalized_word)
+                or normalized_word in g2p.homograph2features
+            ):
+                results[i] = self._filter_phonemes(g2p(word))
+            elif normalized_word in g2p.cmu:
+                results[i] = self._filter_phonemes(g2p.cmu[normalized_word][0])
+            else:
+                oov_words.setdefault(normalized_word, []).append(i)
+
+        # Sort by length so that each batch has little padding
+        oov_sorted = sorted(oov_words, key=len)
+        for start in range(0, len(oov_sorted), self.batch_size):
+            batch = oov_sorted[start:start + self.batch_size]
+            for word, phonemes in zip(batch, self._predict_batch(batch)):
+                phonemes = self._filter_phonemes(phonemes)
+                for i in oov_words[word]:
+                    results[i] = list(phonemes)
+
+        return results
@@ -0,0 +1,136 @@
+import os
+from typing import List, Optional, Union
+
+from transphonator.phoneme.base_retriever import BasePhonemeRetriever
+from transphonator.phoneme.cmu_retriever import CMURetriever
+from transphonator.utils.cache import get_fingerprint, get_sources_stamps
+from transphonator.utils.sstable import SortedStringTable, write_table
+
+LEXICON_SUFFIX = ".lex"
+
+
+def build_lexicon(lexicon_path, cmu_dict_path, fallback_dict_path=None):
+    """Compile the CMU and fallback dictionaries into a lexicon file.
+
+    The lexicon is a sorted string table keyed by the lower-cased word. Each
+    value is the word phonemes, stored as one byte per phoneme that indexes
+    the phonemes symbols saved in the table metadata. Entries of the CMU
+    dictionary take precedence over the fallback dictionary, matching
+    `CMURetriever.get_phonemes`.
+
+    Args:
+        lexicon_path (str): Path to write the lexicon file to.
+        cmu_dict_path (str): Path to the CMU Pronouncing Dictionary file.
+        fallback_dict_path (str, optional): Path to a custom fallback
+        dictionary file. Defaults to None.
+    """
+    english_word_to_phoneme = CMURetriever.parse_fallback_dict(
+        fallback_dict_path
+    )
+    english_word_to_phoneme.update(CMURetriever.parse_cmudict(cmu_dict_path))
+
+    symbols = sorted(
+        {p for phonemes in english_word_to_phoneme.values() for p in phonemes}
+    )
+    if len(symbols) > 256:
+        raise ValueError(
+            f"Too many phoneme symbols ({len(symbols)}) for one-byte codes"
+        )
+    symbol_to_code = {symbol: code for code, symbol in enumerate(symbols)}
+
+    write_table(
+        lexicon_path,
+        (
+            (
+                word.encode("utf-8"),
+                bytes(symbol_to_code[p] for p in phonemes),
+            )
+            for word, phonemes in english_word_to_phoneme.items()
+        ),
+        metadata={
+            "symbols": symbols,
+            "sources": get_sources_stamps([cmu_dict_path, fallback_dict_path]),
+        },
+    )
+
+
+class LexiconRetriever(BasePhonemeRetriever):
+    def __init__(self, lexicon_path: str):
+        """Initialize the LexiconRetriever, which looks words up in a
+        memory-mapped lexicon file built by `build_lexicon`.
+
+        Unlike `CMURetriever`, the dictionary is not loaded into memory;
+        lookups are binary searches over the file pages, which are shared by
+        all processes that open the same lexicon.
+
+        Args:
+            lexicon_path (str): Path to the lexicon file.
+        """
+        self.lexicon_path = lexicon_path
+        self.lexicon = SortedStringTable(lexicon_path)
+        self.symbols: List[str] = self.lexicon.metadata["symbols"]
+
+    @classmethod
+    def from_dicts(
+        cls,
+        cmu_dict_path: str,
+        fallback_dict_path: Optional[str] = None,
+        lexicon_path: Optional[str] = None,
+    ) -> "LexiconRetriever":
+        """Open the lexicon of the given dictionaries, (re)building it if it
+        is missing or older than the dictionaries.
+
+        Args:
+            cmu_dict_path (str): Path to the CMU Pronouncing Dictionary file.
+            fallback_dict_path (str, optional): Path to a custom fallback
+            dictionary file. Defaults to None.
+            lexicon_path (str, optional): Path of the lexicon file. Defaults
+            to the CMU dictionary path with a `.lex` suffix.
+
+        Returns:
+            LexiconRetriever: The retriever over the up-to-date lexicon.
+        """
+        if lexicon_path is None:
+            lexicon_path = cmu_dict_path + LEXICON_SUFFIX
+
+        stamps = get_sources_stamps([cmu_dict_path, fallback_dict_path])
+        if os.path.isfile(lexicon_path):
+            retriever = cls(lexicon_path)
+            if retriever.lexicon.metadata.get("sources") == stamps:
+                return retriever
+            retriever.lexicon.close()
+
+        build_lexicon(lexicon_path, cmu_dict_path, fallback_dict_path)
+        return cls(lexicon_path)
+
+    def fingerprint(self) -> str:
+        """Hash of the stamps of the dictionaries the lexicon is built
+        from."""
+        return get_fingerprint([type(self).__name__, self.sources_stamps()])
+
+    def sources_stamps(self) -> List[List[int]]:
+        """Stamps of the dictionaries the lexicon was built from."""
+        return self.lexicon.metadata.get("sources", [])
+
+    def __getstate__(self):
+        # The memory map is reopened, not copied, when pickled to a worker
+        return {"lexicon_path": self.lexicon_path}
+
+    def __setstate__(self, state):
+        self.__init__(state["lexicon_path"])
+
+    def get_phonemes(self, word: str) -> Union[List[str], None]:
+        """Retrieve the phonemes for a given word from the lexicon.
+
+        Args:
+            word (str): The word for which to retrieve the phonemes.
+
+        Returns:
+            list: A list of phonemes corresponding to the input word.
+                  If the word is not found in the lexicon, None is returned.
+        """
+        codes = self.lexicon.get(word.lower().encode("utf-8"))
+        if codes is None:
+            return None
+        symbols = self.symbols
+        return [symbols[code] for code in codes]
@@ -1,8 +1,26 @@
 from abc import ABC, abstractmethod
-from typing import Union
+from itertools import islice
+from typing import Iterable, Iterator, List, Union
 
 
 class BaseTransliterator(ABC):
     @abstractmethod
     def transphonate(self, word: str) -> Union[str, None]:
         pass
+
+    def transphonate_batch(self, words: List[str]) -> List[Union[str, None]]:
+        """Transphonate a list of words, in the same order."""
+        return [self.transphonate(word) for word in words]
+
+    def transphonate_iter(
+        self, words: Iterable[str], batch_size: int = 1024
+    ) -> Iterator[Union[str, None]]:
+        """Lazily transphonate an iterable of words in batches of
+        `batch_size`, yielding one result per word in the input order.
+        """
+        words = iter(words)
+        while True:
+            batch = list(islice(words, batch_size))
+            if not batch:
+                return
+            yield from self.transphonate_batch(batch)
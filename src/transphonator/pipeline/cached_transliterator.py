@@ -0,0 +1,183 @@
+import sqlite3
+from typing import Dict, List, Optional, Union
+
+from transphonator.pipeline.base_transliterator import BaseTransliterator
+from transphonator.pipeline.transliterator import TranslitPipeline
+
+# Maximum number of words per SQL query (SQLite variables limit is 999)
+QUERY_CHUNK_SIZE = 900
+# Version of the cache table layout, stored as the database user_version
+CACHE_SCHEMA_VERSION = 2
+
+
+class CachedTranslitPipeline(BaseTransliterator):
+    def __init__(
+        self,
+        pipeline: TranslitPipeline,
+        cache_path: str,
+        max_entries: int = 1_000_000,
+        retriever_key: Optional[str] = None,
+    ):
+        """Initialize the CachedTranslitPipeline, which keeps the results of
+        a pipeline in a persistent SQLite cache shared across runs.
+
+        Results are keyed by (word, retriever, retriever version, map
+        version, rules version). The versions are the fingerprints of the
+        pipeline retriever, map and rules, so changing the dictionary files
+        or the tables invalidates the cached results; the stale rows of the
+        retriever are removed when the cache is opened. The least recently
+        used rows are evicted beyond `max_entries`.
+
+        Args:
+            pipeline (TranslitPipeline): The pipeline to cache.
+            cache_path (str): Path of the SQLite cache file.
+            max_entries (int, optional): Maximum number of cached words.
+            Defaults to 1,000,000.
+            retriever_key (str, optional): Name of the phoneme retriever
+            configuration. Defaults to the retriever class name.
+        """
+        self.pipeline = pipeline
+        self.max_entries = max_entries
+        self.retriever_key = (
+            retriever_key or type(pipeline.phoneme_retriever).__name__
+        )
+        self.retriever_version = pipeline.phoneme_retriever.fingerprint()
+        self.map_version = pipeline.transliteration_map.fingerprint()
+        self.rules_version = pipeline.transliteration_rules.fingerprint()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+        # The connection is used by one thread at a time, but not always the
+        # one that opened it (e.g. the batch thread of the server)
+        self.connection = sqlite3.connect(
+            cache_path, check_same_thread=False
+        )
+        (schema_version,) = self.connection.execute(
+            "PRAGMA user_version"
+        ).fetchone()
+        if schema_version != CACHE_SCHEMA_VERSION:
+            self.connection.executescript(
+                f"""
+                DROP TABLE IF EXISTS transphonations;
+                PRAGMA user_version = {CACHE_SCHEMA_VERSION};
+                """
+            )
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS transphonations (
+                word TEXT NOT NULL,
+                retriever TEXT NOT NULL,
+                retriever_version TEXT NOT NULL,
+                map_version TEXT NOT NULL,
+                rules_version TEXT NOT NULL,
+                transliteration TEXT,
+                last_used INTEGER NOT NULL,
+                PRIMARY KEY (
+                    word, retriever, retriever_version, map_version,
+                    rules_version
+                )
+            );
+            CREATE INDEX IF NOT EXISTS transphonations_last_used
+                ON transphonations (last_used);
+            """
+        )
+        self._version = (
+            self.retriever_key,
+            self.retriever_version,
+            self.map_version,
+            self.rules_version,
+        )
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM transphonations WHERE retriever = ? "
+                "AND (retriever_version != ? OR map_version != ? "
+                "OR rules_version != ?)",
+                self._version,
+            )
+        self._size, self._clock = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(MAX(last_used), 0) "
+            "FROM transphonations"
+        ).fetchone()
+
+    def _select(self, words: List[str]) -> Dict[str, Union[str, None]]:
+        """Get the cached transliterations of the words found in the cache."""
+        cached = {}
+        for start in range(0, len(words), QUERY_CHUNK_SIZE):
+            chunk = words[start:start + QUERY_CHUNK_SIZE]
+            rows = self.connection.execute(
+                "SELECT word, transliteration FROM transphonations "
+                "WHERE retriever = ? AND retriever_version = ? "
+                "AND map_version = ? AND rules_version = ? "
+                f"AND word IN ({', '.join('?' * len(chunk))})",
+                (*self._version, *chunk),
+            )
+            cached.update(rows)
+        return cached
+
+    def _evict(self):
+        """Remove the least recently used rows beyond `max_entries`. Every
+        row has its own `last_used` tick, so the order is strict."""
+        excess = self._size - self.max_entries
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM transphonations WHERE rowid IN ("
+                "SELECT rowid FROM transphonations "
+                "ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self._size -= excess
+
+    def transphonate(self, word: str) -> Union[str, None]:
+        """Transphonate a word, using the cached result if any."""
+        return self.transphonate_batch([word])[0]
+
+    def transphonate_batch(self, words: List[str]) -> List[Union[str, None]]:
+        """Transphonate a list of words. Only the words that are not in the
+        cache are sent to the pipeline; their results are then cached.
+
+        Args:
+            words (List[str]): The words to transphonate.
+
+        Returns:
+            List[Union[str, None]]: The transphonation of each word, or None
+            for words that have no phonemes.
+        """
+        unique_words = list(dict.fromkeys(words))
+        results = self._select(unique_words)
+        missing_words = [word for word in unique_words if word not in results]
+        hit_words = [word for word in unique_words if word in results]
+        self.stats["hits"] += len(hit_words)
+        self.stats["misses"] += len(missing_words)
+
+        computed = self.pipeline.transphonate_batch(missing_words)
+        results.update(zip(missing_words, computed))
+
+        # Each word gets its own tick, in the batch order, so that the last
+        # words of a batch are the most recently used ones whether they were
+        # hits or misses
+        ticks = {
+            word: self._clock + tick
+            for tick, word in enumerate(unique_words, start=1)
+        }
+        self._clock += len(unique_words)
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE transphonations SET last_used = ? WHERE word = ? "
+                "AND retriever = ? AND retriever_version = ? "
+                "AND map_version = ? AND rules_version = ?",
+                ((ticks[word], word, *self._version) for word in hit_words),
+            )
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO transphonations VALUES "
+                "(?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (word, *self._version, transliteration, ticks[word])
+                    for word, transliteration in zip(missing_words, computed)
+                ),
+            )
+            self._size += len(missing_words)
+            self._evict()
+
+        return [results[word] for word in words]
+
+    def close(self):
+        self.connection.close()
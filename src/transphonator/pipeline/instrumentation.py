@@ -0,0 +1,122 @@
+from typing import Callable, Dict, List
+
+PIPELINE_STAGES = ("retrieve", "map", "rules")
+
+# Callable returning hit/miss counters: {source: {"hits": n, "misses": m}}
+CacheStatsSource = Callable[[], Dict[str, Dict[str, int]]]
+
+
+class PipelineInstrumentation:
+    def __init__(self):
+        """Initialize the PipelineInstrumentation, which collects the
+        per-stage timers and call counts of a `TranslitPipeline`, the number
+        of words without a transliteration and the hit rates of the caches
+        registered with `add_cache_source`.
+        """
+        self.cache_sources: Dict[str, CacheStatsSource] = {}
+        self.reset()
+
+    def reset(self):
+        """Reset the timers and counters."""
+        self.stage_seconds = dict.fromkeys(PIPELINE_STAGES, 0.0)
+        self.stage_calls = dict.fromkeys(PIPELINE_STAGES, 0)
+        self.words_count = 0
+        self.none_count = 0
+
+    def add_cache_source(self, name: str, get_stats: CacheStatsSource):
+        """Register a callable that returns hit/miss counters, such as
+        `CascadingRetriever.get_stats`. It is called on export only.
+        """
+        self.cache_sources[name] = get_stats
+
+    def record_stage(self, stage: str, seconds: float, calls: int = 1):
+        """Add the time spent in `calls` calls of a stage."""
+        self.stage_seconds[stage] += seconds
+        self.stage_calls[stage] += calls
+
+    def record_results(self, results: List):
+        """Count the words and the words with no transliteration."""
+        self.words_count += len(results)
+        self.none_count += sum(result is None for result in results)
+
+    def get_cache_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get the hit/miss counters and hit rate of each cache."""
+        cache_stats = {}
+        for source_name, get_stats in self.cache_sources.items():
+            for name, counters in get_stats().items():
+                hits, misses = counters["hits"], counters["misses"]
+                cache_stats[f"{source_name}.{name}"] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": hits / (hits + misses) if hits + misses else 0,
+                }
+        return cache_stats
+
+    def to_dict(self) -> dict:
+        """Export the collected data as a dict."""
+        return {
+            "stages": {
+                stage: {
+                    "seconds": self.stage_seconds[stage],
+                    "calls": self.stage_calls[stage],
+                }
+                for stage in PIPELINE_STAGES
+            },
+            "words": self.words_count,
+            "none_words": self.none_count,
+            "caches": self.get_cache_stats(),
+        }
+
+    def to_prometheus(self, prefix: str = "transphonator") -> str:
+        """Export the collected data in the Prometheus text format."""
+        lines = []
+
+        def add_metric(name, metric_type, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{prefix}_{name}{labels} {value}")
+
+        add_metric(
+            "stage_seconds_total",
+            "counter",
+            "Time spent in each pipeline stage.",
+            [
+                (f'{{stage="{stage}"}}', self.stage_seconds[stage])
+                for stage in PIPELINE_STAGES
+            ],
+        )
+        add_metric(
+            "stage_calls_total",
+            "counter",
+            "Number of calls of each pipeline stage.",
+            [
+                (f'{{stage="{stage}"}}', self.stage_calls[stage])
+                for stage in PIPELINE_STAGES
+            ],
+        )
+        add_metric(
+            "words_total",
+            "counter",
+            "Number of transphonated words.",
+            [("", self.words_count)],
+        )
+        add_metric(
+            "none_words_total",
+            "counter",
+            "Number of words with no transliteration.",
+            [("", self.none_count)],
+        )
+
+        cache_stats = self.get_cache_stats()
+        for counter in ("hits", "misses"):
+            add_metric(
+                f"cache_{counter}_total",
+                "counter",
+                f"Number of cache {counter}.",
+                [
+                    (f'{{cache="{name}"}}', stats[counter])
+                    for name, stats in cache_stats.items()
+                ],
+            )
+        return "\n".join(lines) + "\n"
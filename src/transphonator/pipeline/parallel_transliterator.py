@@ -0,0 +1,158 @@
+import multiprocessing
+from collections import deque
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from transphonator.pipeline.base_transliterator import BaseTransliterator
+
+# Pipeline used by the worker processes. With the "fork" start method it is
+# set before the workers are started, so that they inherit the loaded
+# dictionaries (copy-on-write) instead of loading them again.
+_worker_pipeline: Optional[BaseTransliterator] = None
+
+
+def _init_worker(pipeline: BaseTransliterator):
+    global _worker_pipeline
+    _worker_pipeline = pipeline
+
+
+def _get_stats_source(pipeline: BaseTransliterator):
+    """Get the phoneme retriever of a (possibly wrapped) pipeline if it
+    counts its cache hits with `get_stats`, else None."""
+    while pipeline is not None:
+        retriever = getattr(pipeline, "phoneme_retriever", None)
+        if retriever is not None:
+            return retriever if hasattr(retriever, "get_stats") else None
+        pipeline = getattr(pipeline, "pipeline", None)
+    return None
+
+
+def _transphonate_chunk(
+    words: List[str],
+) -> Tuple[List[Union[str, None]], Dict[str, Dict[str, int]]]:
+    """Transphonate a chunk in a worker, along with the retriever counters
+    incremented while doing it, which would be lost with the worker."""
+    source = _get_stats_source(_worker_pipeline)
+    if source is None:
+        return _worker_pipeline.transphonate_batch(words), {}
+
+    before = source.get_stats()
+    results = _worker_pipeline.transphonate_batch(words)
+    stats = {
+        name: {
+            key: value - before.get(name, {}).get(key, 0)
+            for key, value in counters.items()
+        }
+        for name, counters in source.get_stats().items()
+    }
+    return results, stats
+
+
+class ParallelTranslitPipeline(BaseTransliterator):
+    def __init__(
+        self,
+        pipeline: BaseTransliterator,
+        processes: Optional[int] = None,
+        chunk_size: int = 1024,
+    ):
+        """Initialize the ParallelTranslitPipeline, which fans chunks of words
+        out to a pool of worker processes running `pipeline`.
+
+        The retriever counters incremented by the workers are sent back with
+        the results and added to the counters of the `pipeline` retriever, so
+        its `get_stats` covers all the processes.
+
+        On platforms that support it, the workers are forked from the current
+        process and share the already loaded pipeline; otherwise the pipeline
+        is pickled once to each worker.
+
+        Args:
+            pipeline (BaseTransliterator): The pipeline run by the workers.
+            processes (int, optional): Number of worker processes. Defaults to
+            the number of CPUs.
+            chunk_size (int, optional): Number of words sent to a worker at
+            once. Defaults to 1024.
+        """
+        self.pipeline = pipeline
+        self.processes = processes or multiprocessing.cpu_count()
+        self.chunk_size = chunk_size
+        self._pool = None
+        self._stats_source = _get_stats_source(pipeline)
+
+    def _merge_stats(self, stats: Dict[str, Dict[str, int]]):
+        for name, counters in stats.items():
+            merged = self._stats_source.stats.setdefault(name, {})
+            for key, value in counters.items():
+                merged[key] = merged.get(key, 0) + value
+
+    def _get_pool(self):
+        if self._pool is None:
+            if "fork" in multiprocessing.get_all_start_methods():
+                global _worker_pipeline
+                _worker_pipeline = self.pipeline
+                self._pool = multiprocessing.get_context("fork").Pool(
+                    self.processes
+                )
+            else:
+                self._pool = multiprocessing.Pool(
+                    self.processes,
+                    initializer=_init_worker,
+                    initargs=(self.pipeline,),
+                )
+        return self._pool
+
+    def transphonate(self, word: str) -> Union[str, None]:
+        """Transphonate a word in the current process."""
+        return self.pipeline.transphonate(word)
+
+    def transphonate_batch(self, words: List[str]) -> List[Union[str, None]]:
+        """Transphonate a list of words with the worker processes."""
+        return list(self.transphonate_iter(words))
+
+    def transphonate_iter(
+        self, words: Iterable[str], batch_size: Optional[int] = None
+    ) -> Iterator[Union[str, None]]:
+        """Lazily transphonate an iterable of words with the worker
+        processes, yielding the results in the input order.
+
+        At most two chunks per worker are in flight, so the input is consumed
+        as the results are yielded.
+
+        Args:
+            words (Iterable[str]): The words to transphonate.
+            batch_size (int, optional): Number of words sent to a worker at
+            once. Defaults to `chunk_size`.
+
+        Yields:
+            Union[str, None]: The transphonation of each word, or None for
+            words that have no phonemes.
+        """
+        pool = self._get_pool()
+        batch_size = batch_size or self.chunk_size
+        words = iter(words)
+        pending = deque()
+        while True:
+            while len(pending) < 2 * self.processes:
+                chunk = list(islice(words, batch_size))
+                if not chunk:
+                    break
+                pending.append(pool.apply_async(_transphonate_chunk, (chunk,)))
+            if not pending:
+                return
+            results, stats = pending.popleft().get()
+            if self._stats_source is not None:
+                self._merge_stats(stats)
+            yield from results
+
+    def close(self):
+        """Stop the worker processes."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
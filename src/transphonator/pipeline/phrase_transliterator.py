@@ -0,0 +1,112 @@
+import re
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Union
+
+from transphonator.pipeline.base_transliterator import BaseTransliterator
+
+# Tokens are separated by runs of spaces, hyphens and underscores
+SEPARATORS_REGEX = re.compile(r"([\s_-]+)")
+EDGE_SEPARATORS_REGEX = re.compile(r"^[\s_-]+|[\s_-]+$")
+
+
+class PhraseTranslitPipeline(BaseTransliterator):
+    def __init__(
+        self,
+        pipeline: BaseTransliterator,
+        hyphen_separator: str = "-",
+        cache_size: int = 65536,
+    ):
+        """Initialize the PhraseTranslitPipeline, which transphonates
+        multi-word names such as "Addis Ababa", "addis_ababa" or
+        "Jean-Paul" token by token.
+
+        Tokens are transphonated through a shared LRU cache, so tokens that
+        repeat across names (e.g. "San", "New") are sent to the pipeline
+        once. The output tokens are joined with a space, or with
+        `hyphen_separator` where the input tokens were hyphenated.
+
+        Args:
+            pipeline (BaseTransliterator): The pipeline for single tokens.
+            hyphen_separator (str, optional): Separator of hyphenated tokens
+            in the output. Defaults to "-".
+            cache_size (int, optional): Maximum number of cached tokens.
+            Defaults to 65536.
+        """
+        self.pipeline = pipeline
+        self.hyphen_separator = hyphen_separator
+        self.cache_size = cache_size
+        self.token_cache: "OrderedDict[str, Union[str, None]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0}
+
+    def _split(self, phrase: str) -> Tuple[List[str], List[str]]:
+        """Split a phrase into lower-cased tokens and output separators."""
+        phrase = EDGE_SEPARATORS_REGEX.sub("", phrase)
+        if not phrase:
+            return [], []
+        parts = SEPARATORS_REGEX.split(phrase)
+        tokens = [token.lower() for token in parts[::2]]
+        separators = [
+            self.hyphen_separator if "-" in separator else " "
+            for separator in parts[1::2]
+        ]
+        return tokens, separators
+
+    def _transphonate_tokens(
+        self, tokens: List[str]
+    ) -> Dict[str, Union[str, None]]:
+        """Transphonate tokens through the cache; the missing tokens are sent
+        to the pipeline in one batch.
+        """
+        token_cache = self.token_cache
+        transliterations = {}
+        missing_tokens = []
+        for token in dict.fromkeys(tokens):
+            if token in token_cache:
+                self.stats["hits"] += 1
+                token_cache.move_to_end(token)
+                transliterations[token] = token_cache[token]
+            else:
+                self.stats["misses"] += 1
+                missing_tokens.append(token)
+
+        computed = self.pipeline.transphonate_batch(missing_tokens)
+        transliterations.update(zip(missing_tokens, computed))
+        token_cache.update(zip(missing_tokens, computed))
+        while len(token_cache) > self.cache_size:
+            token_cache.popitem(last=False)
+        return transliterations
+
+    def transphonate(self, phrase: str) -> Union[str, None]:
+        """Transphonate a phrase into the target language."""
+        return self.transphonate_batch([phrase])[0]
+
+    def transphonate_batch(
+        self, phrases: List[str]
+    ) -> List[Union[str, None]]:
+        """Transphonate a list of phrases.
+
+        Args:
+            phrases (List[str]): The phrases to transphonate.
+
+        Returns:
+            List[Union[str, None]]: The transphonation of each phrase, or
+            None if a token of the phrase has no phonemes.
+        """
+        split_phrases = [self._split(phrase) for phrase in phrases]
+        transliterations = self._transphonate_tokens(
+            [token for tokens, _ in split_phrases for token in tokens]
+        )
+
+        results = []
+        for tokens, separators in split_phrases:
+            tokens_translit = [transliterations[token] for token in tokens]
+            if not tokens_translit or None in tokens_translit:
+                results.append(None)
+                continue
+            result = tokens_translit[0]
+            for separator, token_translit in zip(
+                separators, tokens_translit[1:]
+            ):
+                result += separator + token_translit
+            results.append(result)
+        return results
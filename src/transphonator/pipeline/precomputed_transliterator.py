@@ -0,0 +1,117 @@
+from typing import Iterable, List, Union
+
+from transphonator.pipeline.base_transliterator import BaseTransliterator
+from transphonator.pipeline.transliterator import TranslitPipeline
+from transphonator.utils.sstable import SortedStringTable, write_table
+
+TABLE_SUFFIX = ".translit"
+
+
+def get_table_versions(pipeline: TranslitPipeline) -> dict:
+    """Versions of the pipeline tables and stamps of the dictionaries a
+    precomputed table depends on."""
+    return {
+        "map_version": pipeline.transliteration_map.fingerprint(),
+        "rules_version": pipeline.transliteration_rules.fingerprint(),
+        "sources": pipeline.phoneme_retriever.sources_stamps(),
+    }
+
+
+def build_translit_table(
+    table_path: str,
+    pipeline: TranslitPipeline,
+    words: Iterable[str],
+    batch_size: int = 4096,
+):
+    """Precompute the transliterations of a vocabulary into a table file.
+
+    The table is a sorted string table keyed by the lower-cased word; words
+    with no transliteration are not stored. The versions of the pipeline map
+    and rules and the stamps of the retriever dictionaries are saved in the
+    table metadata.
+
+    Args:
+        table_path (str): Path to write the table file to.
+        pipeline (TranslitPipeline): The pipeline that computes the
+        transliterations.
+        words (Iterable[str]): The vocabulary, e.g. the words of the CMU and
+        fallback dictionaries.
+        batch_size (int, optional): Number of words transphonated at once.
+        Defaults to 4096.
+    """
+    words = list(dict.fromkeys(word.lower() for word in words))
+    items = []
+    for start in range(0, len(words), batch_size):
+        batch = words[start:start + batch_size]
+        for word, transliteration in zip(
+            batch, pipeline.transphonate_batch(batch)
+        ):
+            if transliteration is not None:
+                items.append(
+                    (word.encode("utf-8"), transliteration.encode("utf-8"))
+                )
+
+    write_table(table_path, items, metadata=get_table_versions(pipeline))
+
+
+class PrecomputedTranslitPipeline(BaseTransliterator):
+    def __init__(self, table_path: str, pipeline: TranslitPipeline):
+        """Initialize the PrecomputedTranslitPipeline, which serves the words
+        of a table built by `build_translit_table` with a single lookup and
+        runs `pipeline` only on the other words.
+
+        The table is built from the CMU and fallback dictionaries, so it
+        gives the same results as pipelines whose retriever looks these
+        dictionaries up first (`CMURetriever`, `LexiconRetriever` or
+        `CascadingRetriever`).
+
+        Args:
+            table_path (str): Path of the table file.
+            pipeline (TranslitPipeline): The pipeline for the words that are
+            not in the table.
+
+        Raises:
+            ValueError: If the table was built with other map or rules
+            versions than the pipeline ones, or from other versions of the
+            retriever dictionaries.
+        """
+        self.table = SortedStringTable(table_path)
+        self.pipeline = pipeline
+
+        versions = get_table_versions(pipeline)
+        table_versions = {
+            key: self.table.metadata.get(key) for key in versions
+        }
+        if table_versions != versions:
+            self.table.close()
+            raise ValueError(
+                f"{table_path} was built with other transliteration tables "
+                "or dictionaries "
+                f"({table_versions}, expected {versions}); rebuild it."
+            )
+
+    def _lookup(self, word: str) -> Union[str, None]:
+        transliteration = self.table.get(word.lower().encode("utf-8"))
+        if transliteration is None:
+            return None
+        return transliteration.decode("utf-8")
+
+    def transphonate(self, word: str) -> Union[str, None]:
+        """Transphonate a word, from the table if it is in it."""
+        transliteration = self._lookup(word)
+        if transliteration is None:
+            transliteration = self.pipeline.transphonate(word)
+        return transliteration
+
+    def transphonate_batch(self, words: List[str]) -> List[Union[str, None]]:
+        """Transphonate a list of words; only the words that are not in the
+        table are sent to the pipeline, in one batch.
+        """
+        results = {word: self._lookup(word) for word in dict.fromkeys(words)}
+        oov_words = [
+            word for word, result in results.items() if result is None
+        ]
+        results.update(
+            zip(oov_words, self.pipeline.transphonate_batch(oov_words))
+        )
+        return [results[word] for word in words]
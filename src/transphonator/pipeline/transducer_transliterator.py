@@ -0,0 +1,382 @@
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple, Union
+
+from transphonator.phoneme.base_retriever import BasePhonemeRetriever
+from transphonator.pipeline.base_transliterator import BaseTransliterator
+from transphonator.translit_maps.base_map import BaseTranslitMap
+from transphonator.translit_rules.arabic_rules import TranslitRuleAra
+
+# Characters with a special meaning in a pattern outside of a set
+PATTERN_SPECIAL_CHARS = set("^$*+?{}[]|.()")
+# Result of matching a rule on text that may still be extended
+UNDECIDED = -1
+
+# Rule pattern: (anchored at the start, sets of the matched characters, sets
+# of the lookahead characters, anchored at the end)
+RulePattern = Tuple[
+    bool, List[FrozenSet[str]], List[FrozenSet[str]], bool
+]
+# Output operation: text[start:end] is emitted as is (None) or replaced
+TextOp = Tuple[int, int, Optional[Callable[[str], str]]]
+# Transition action: (emitted text, next pending text, next state, mapped
+# phoneme, number of settled characters of the pending text followed by the
+# mapped phoneme, operations on these characters or None to emit them as
+# is). The emitted and pending texts are precomputed from states without
+# pending text, and None for the other states.
+TransducerAction = Tuple[
+    Optional[str], Optional[str], int, str, int, Optional[List[TextOp]]
+]
+# Transducer state: (whether the start of the text is passed, character
+# classes of the pending text)
+TransducerState = Tuple[bool, Tuple[int, ...]]
+
+
+def _parse_escape(pattern: str, pos: int) -> str:
+    char = pattern[pos + 1:pos + 2]
+    if not char or char.isalnum():
+        raise ValueError(f"Unsupported escape in rule pattern: {pattern}")
+    return char
+
+
+def _parse_set(pattern: str, pos: int) -> Tuple[FrozenSet[str], int]:
+    """Parse the character set starting after the `[` at `pos`."""
+    if pattern[pos:pos + 1] == "^":
+        raise ValueError(f"Unsupported negated set in: {pattern}")
+    chars = set()
+    while pos < len(pattern) and pattern[pos] != "]":
+        if pattern[pos] == "\\":
+            char = _parse_escape(pattern, pos)
+            pos += 2
+        else:
+            char = pattern[pos]
+            pos += 1
+        if pattern[pos:pos + 1] == "-" and pattern[pos + 1:pos + 2] not in (
+            "", "]"
+        ):
+            last = pattern[pos + 1]
+            if last == "\\":
+                last = _parse_escape(pattern, pos + 1)
+            pos += 3 if pattern[pos + 1] == "\\" else 2
+            chars.update(map(chr, range(ord(char), ord(last) + 1)))
+        else:
+            chars.add(char)
+    if pos == len(pattern):
+        raise ValueError(f"Unterminated set in rule pattern: {pattern}")
+    return frozenset(chars), pos + 1
+
+
+def parse_rule_pattern(pattern: str) -> RulePattern:
+    """Parse a rule pattern made of single characters and character sets,
+    with optional `^` and `$` anchors and a trailing lookahead, such as
+    `^[ab]c(?=[de])`. These patterns match a fixed number of characters,
+    so whether they match can be decided on a bounded context.
+
+    Args:
+        pattern (str): The regular expression of a rule.
+
+    Raises:
+        ValueError: If the pattern uses any other syntax.
+
+    Returns:
+        RulePattern: The parsed pattern.
+    """
+    anchored_start = pattern.startswith("^")
+    anchored_end = False
+    chars: List[FrozenSet[str]] = []
+    lookahead: List[FrozenSet[str]] = []
+    items: Optional[List[FrozenSet[str]]] = chars
+    pos = int(anchored_start)
+    while pos < len(pattern):
+        char = pattern[pos]
+        if pattern.startswith("(?=", pos) and items is chars:
+            items = lookahead
+            pos += 3
+            continue
+        if char == ")" and items is lookahead:
+            items = None
+            pos += 1
+            continue
+        if char == "$" and pos == len(pattern) - 1:
+            anchored_end = True
+            pos += 1
+            continue
+        if items is None:
+            raise ValueError(f"Unsupported rule pattern: {pattern}")
+
+        if char == "[":
+            charset, pos = _parse_set(pattern, pos + 1)
+        elif char == "\\":
+            charset = frozenset(_parse_escape(pattern, pos))
+            pos += 2
+        elif char in PATTERN_SPECIAL_CHARS:
+            raise ValueError(f"Unsupported rule pattern: {pattern}")
+        else:
+            charset = frozenset(char)
+            pos += 1
+        items.append(charset)
+
+    if items is lookahead:
+        raise ValueError(f"Unterminated lookahead in rule pattern: {pattern}")
+    return anchored_start, chars, lookahead, anchored_end
+
+
+class TranslitTransducer:
+    def __init__(
+        self,
+        transliteration_map: BaseTranslitMap,
+        transliteration_rules: TranslitRuleAra,
+    ):
+        """Initialize the TranslitTransducer, which compiles a phoneme map
+        and a rule table into a single deterministic transducer from
+        phonemes to text.
+
+        The rule patterns are parsed into sequences of character sets (see
+        `parse_rule_pattern`), and characters are grouped into classes
+        that belong to the same sets, so they match the same rules. A state
+        holds the classes of the pending text, i.e. the last characters
+        whose rule is not decided yet: a rule may still match them
+        depending on what follows. Each transition consumes one phoneme,
+        emits the characters that are settled, with the replacements of the
+        rules that matched them, and moves to the next state; the final
+        output of a state settles its pending text with the end-of-text
+        rules. The rules are decided exactly as the rule table regex scans
+        the whole text, so the output is identical to mapping the phonemes
+        then applying the rules. The mapped text must not contain line
+        breaks, before which `$` also matches.
+
+        The transducer is determinized lazily: a transition is computed the
+        first time it is taken, then it is a dict lookup.
+
+        Args:
+            transliteration_map (BaseTranslitMap): The phoneme map.
+            transliteration_rules (TranslitRuleAra): The rules.
+
+        Raises:
+            ValueError: If a rule pattern is not supported by
+            `parse_rule_pattern`.
+        """
+        self.transliteration_map = transliteration_map
+
+        # Distinct character sets of the rules; a rule item is the index of
+        # its set
+        self.charsets: List[FrozenSet[str]] = []
+        set_ids: Dict[FrozenSet[str], int] = {}
+        self._rules = []
+        self.max_context = 0
+        for name, pattern, _ in transliteration_rules.rules:
+            anchored_start, chars, lookahead, anchored_end = (
+                parse_rule_pattern(pattern)
+            )
+            items = [
+                set_ids.setdefault(charset, len(set_ids))
+                for charset in chars + lookahead
+            ]
+            self._rules.append(
+                (
+                    anchored_start,
+                    items,
+                    len(chars),
+                    anchored_end,
+                    transliteration_rules.replacements[name],
+                )
+            )
+            # Maximum number of characters a rule inspects
+            self.max_context = max(self.max_context, len(items))
+        self.charsets = list(set_ids)
+
+        # Character classes: class -> whether it is in each set. Class 0
+        # is in no set.
+        self.class_signatures: List[Tuple[bool, ...]] = [
+            (False,) * len(self.charsets)
+        ]
+        self._signature_ids = {self.class_signatures[0]: 0}
+        self._char_classes: Dict[str, int] = {}
+
+        self.states: List[TransducerState] = []
+        self._state_ids: Dict[TransducerState, int] = {}
+        # State -> phoneme -> action
+        self.transitions: List[Dict[str, TransducerAction]] = []
+        # State -> operations on the pending text at the end of the text
+        self.final_ops: List[Optional[List[TextOp]]] = []
+        self._get_state((False, ()))
+
+    def _get_class(self, char: str) -> int:
+        char_class = self._char_classes.get(char)
+        if char_class is None:
+            signature = tuple(char in charset for charset in self.charsets)
+            char_class = self._signature_ids.get(signature)
+            if char_class is None:
+                char_class = len(self.class_signatures)
+                self._signature_ids[signature] = char_class
+                self.class_signatures.append(signature)
+            self._char_classes[char] = char_class
+        return char_class
+
+    def _match(
+        self,
+        rule: Tuple,
+        classes: Tuple[int, ...],
+        pos: int,
+        at_start: bool,
+        final: bool,
+    ) -> Optional[int]:
+        """Match a rule at `pos` of a text given by its character classes.
+
+        Returns:
+            Optional[int]: The end of the match, None if the rule does not
+            match, or UNDECIDED if it depends on the text that follows.
+        """
+        anchored_start, items, size, anchored_end, _ = rule
+        if anchored_start and not at_start:
+            return None
+        signatures = self.class_signatures
+        for index, set_id in enumerate(items, start=pos):
+            if index == len(classes):
+                return None if final else UNDECIDED
+            if not signatures[classes[index]][set_id]:
+                return None
+        end = pos + size
+        if anchored_end:
+            if end != len(classes):
+                return None
+            if not final:
+                return UNDECIDED
+        return end
+
+    def _scan(
+        self, state: TransducerState, final: bool
+    ) -> Tuple[Optional[List[TextOp]], int]:
+        """Decide the rules on the pending text of a state, from its start
+        and as far as possible.
+
+        Returns:
+            Tuple[Optional[List[TextOp]], int]: The operations that emit the
+            settled characters, or None if they are emitted as is, and the
+            number of settled characters.
+        """
+        started, classes = state
+        ops: List[TextOp] = []
+        pos = 0
+        while pos < len(classes):
+            at_start = not started and pos == 0
+            for rule in self._rules:
+                end = self._match(rule, classes, pos, at_start, final)
+                if end is not None:
+                    break
+            if end == UNDECIDED:
+                break
+            if end is not None:
+                ops.append((pos, end, rule[-1]))
+                pos = end
+            elif ops and ops[-1][2] is None:
+                ops[-1] = (ops[-1][0], pos + 1, None)
+                pos += 1
+            else:
+                ops.append((pos, pos + 1, None))
+                pos += 1
+
+        if all(replace is None for _, _, replace in ops):
+            return None, pos
+        return ops, pos
+
+    def _get_state(self, state: TransducerState) -> int:
+        state_id = self._state_ids.get(state)
+        if state_id is None:
+            state_id = len(self.states)
+            self._state_ids[state] = state_id
+            self.states.append(state)
+            self.transitions.append({})
+            self.final_ops.append(self._scan(state, final=True)[0])
+        return state_id
+
+    def _add_transition(
+        self, state_id: int, phoneme: str
+    ) -> TransducerAction:
+        equivalent = self.transliteration_map.get_equivalent(phoneme)
+        started, classes = self.states[state_id]
+        classes += tuple(map(self._get_class, equivalent))
+        ops, settled = self._scan((started, classes), final=False)
+        next_state = (started or settled > 0, classes[settled:])
+        output = pending = None
+        if len(classes) == len(equivalent):
+            output = equivalent[:settled]
+            if ops is not None:
+                output = self._apply(equivalent, ops)
+            pending = equivalent[settled:]
+        action = (
+            output,
+            pending,
+            self._get_state(next_state),
+            equivalent,
+            settled,
+            ops,
+        )
+        self.transitions[state_id][phoneme] = action
+        return action
+
+    @staticmethod
+    def _apply(text: str, ops: List[TextOp]) -> str:
+        return "".join(
+            text[start:end] if replace is None else replace(text[start:end])
+            for start, end, replace in ops
+        )
+
+    def transduce(self, phonemes: List[str]) -> str:
+        """Convert phonemes to the text produced by the map then the rules.
+
+        Args:
+            phonemes (List[str]): The phonemes of a word.
+
+        Returns:
+            str: The transliteration.
+        """
+        transitions = self.transitions
+        apply = self._apply
+        state_id = 0
+        pending = ""
+        output = ""
+        for phoneme in phonemes:
+            action = transitions[state_id].get(phoneme)
+            if action is None:
+                action = self._add_transition(state_id, phoneme)
+            emitted, next_pending, state_id, equivalent, settled, ops = action
+            if emitted is None:
+                text = pending + equivalent
+                emitted = text[:settled] if ops is None else apply(text, ops)
+                next_pending = text[settled:]
+            output += emitted
+            pending = next_pending
+
+        ops = self.final_ops[state_id]
+        return output + (pending if ops is None else apply(pending, ops))
+
+
+class TransducerTranslitPipeline(BaseTransliterator):
+    def __init__(
+        self,
+        phoneme_retriever: BasePhonemeRetriever,
+        transducer: TranslitTransducer,
+    ):
+        """Initialize the TransducerTranslitPipeline, which converts the
+        retrieved phonemes with a `TranslitTransducer` in one pass instead
+        of a map pass then a rules pass.
+        """
+        self.phoneme_retriever = phoneme_retriever
+        self.transducer = transducer
+
+    def transphonate(self, word: str) -> Union[str, None]:
+        """Transphonate a word into the target language."""
+        phonemes = self.phoneme_retriever.get_phonemes(word)
+        if not phonemes:
+            return None
+        return self.transducer.transduce(phonemes)
+
+    def transphonate_batch(self, words: List[str]) -> List[Union[str, None]]:
+        """Transphonate a list of words, retrieving their phonemes at once."""
+        unique_words = list(dict.fromkeys(words))
+        phonemes_list = self.phoneme_retriever.get_phonemes_batch(unique_words)
+        transduce = self.transducer.transduce
+        results = {
+            word: transduce(phonemes) if phonemes else None
+            for word, phonemes in zip(unique_words, phonemes_list)
+        }
+        return [results[word] for word in words]
@@ -1,7 +1,9 @@
-from typing import Union
+from time import perf_counter
+from typing import List, Optional, Union
 
 from transphonator.phoneme.base_retriever import BasePhonemeRetriever
 from transphonator.pipeline.base_transliterator import BaseTransliterator
+from transphonator.pipeline.instrumentation import PipelineInstrumentation
 from transphonator.translit_maps.base_map import BaseTranslitMap
 from transphonator.translit_rules.base_rules import BaseTranslitRule
 
@@ -12,13 +14,37 @@ class TranslitPipeline(BaseTransliterator):
         phoneme_retriever: BasePhonemeRetriever,
         transliteration_map: BaseTranslitMap,
         transliteration_rules: BaseTranslitRule,
+        instrumentation: Optional[PipelineInstrumentation] = None,
     ):
+        """Initialize the TranslitPipeline.
+
+        Args:
+            phoneme_retriever (BasePhonemeRetriever): Retrieves the phonemes
+            of a word.
+            transliteration_map (BaseTranslitMap): Maps a phoneme to
+            characters of the target language.
+            transliteration_rules (BaseTranslitRule): Adjusts the mapped
+            characters.
+            instrumentation (PipelineInstrumentation, optional): Collects
+            per-stage timers and counters. If the retriever has a `get_stats`
+            method, its counters are reported as cache hit rates. Defaults to
+            None, no instrumentation.
+        """
         self.phoneme_retriever = phoneme_retriever
         self.transliteration_map = transliteration_map
         self.transliteration_rules = transliteration_rules
+        self.instrumentation = instrumentation
+        if instrumentation is not None and hasattr(
+            phoneme_retriever, "get_stats"
+        ):
+            instrumentation.add_cache_source(
+                "retriever", phoneme_retriever.get_stats
+            )
 
     def transphonate(self, word: str) -> Union[str, None]:
         """Transphonate a word into the target language."""
+        if self.instrumentation is not None:
+            return self._transphonate_instrumented(word)
 
         phonemes = self.phoneme_retriever.get_phonemes(word)
         if not phonemes:
@@ -33,3 +59,86 @@ class TranslitPipeline(BaseTransliterator):
         transliteration = self.transliteration_rules.apply(phonemes_equivelant)
 
         return transliteration
+
+    def _transphonate_instrumented(self, word: str) -> Union[str, None]:
+        """`transphonate` with per-stage timers."""
+        instrumentation = self.instrumentation
+
+        start = perf_counter()
+        phonemes = self.phoneme_retriever.get_phonemes(word)
+        instrumentation.record_stage("retrieve", perf_counter() - start)
+        if not phonemes:
+            instrumentation.record_results([None])
+            return None
+
+        start = perf_counter()
+        phonemes_equivelant = "".join(
+            [
+                self.transliteration_map.get_equivalent(phoneme)
+                for phoneme in phonemes
+            ]
+        )
+        instrumentation.record_stage("map", perf_counter() - start)
+
+        start = perf_counter()
+        transliteration = self.transliteration_rules.apply(phonemes_equivelant)
+        instrumentation.record_stage("rules", perf_counter() - start)
+
+        instrumentation.record_results([transliteration])
+        return transliteration
+
+    def transphonate_batch(self, words: List[str]) -> List[Union[str, None]]:
+        """Transphonate a list of words stage by stage.
+
+        Repeated words are processed once. Each stage (phoneme retrieval,
+        mapping and rules) then runs over the whole batch, so the results are
+        identical to calling `transphonate` on each word.
+
+        Args:
+            words (List[str]): The words to transphonate.
+
+        Returns:
+            List[Union[str, None]]: The transphonation of each word, or None
+            for words that have no phonemes.
+        """
+        instrumentation = self.instrumentation
+        unique_words = list(dict.fromkeys(words))
+
+        # Step 1: Phonemes of all words; words without phonemes are dropped
+        start = perf_counter()
+        phonemes_list = self.phoneme_retriever.get_phonemes_batch(unique_words)
+        found = [
+            (word, phonemes)
+            for word, phonemes in zip(unique_words, phonemes_list)
+            if phonemes
+        ]
+        if instrumentation is not None:
+            instrumentation.record_stage(
+                "retrieve", perf_counter() - start, len(unique_words)
+            )
+
+        # Step 2: Map all phoneme sequences
+        start = perf_counter()
+        phonemes_equivelant = self.transliteration_map.get_equivalents_batch(
+            [phonemes for _, phonemes in found]
+        )
+        if instrumentation is not None:
+            instrumentation.record_stage(
+                "map", perf_counter() - start, len(found)
+            )
+
+        # Step 3: Apply the rules
+        start = perf_counter()
+        transliterations = self.transliteration_rules.apply_batch(
+            phonemes_equivelant
+        )
+        if instrumentation is not None:
+            instrumentation.record_stage(
+                "rules", perf_counter() - start, len(found)
+            )
+
+        results = dict(zip((word for word, _ in found), transliterations))
+        results = [results.get(word) for word in words]
+        if instrumentation is not None:
+            instrumentation.record_results(results)
+        return results
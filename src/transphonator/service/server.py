@@ -0,0 +1,293 @@
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from transphonator.pipeline.base_transliterator import BaseTransliterator
+
+HTTP_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        pipeline: BaseTransliterator,
+        max_batch_size: int = 512,
+        max_delay: float = 0.002,
+    ):
+        """Initialize the MicroBatcher, which coalesces the words of
+        concurrent requests into one `transphonate_batch` call.
+
+        A batch is run when it reaches `max_batch_size` words, or `max_delay`
+        seconds after its first request. Batches are run one at a time in a
+        worker thread, so the event loop keeps accepting requests while the
+        pipeline runs.
+
+        Args:
+            pipeline (BaseTransliterator): The transliteration pipeline.
+            max_batch_size (int, optional): Number of words that triggers a
+            batch. Defaults to 512.
+            max_delay (float, optional): Maximum time, in seconds, a request
+            waits for other requests. Defaults to 0.002.
+        """
+        self.pipeline = pipeline
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.batches_count = 0
+        self._pending: List[Tuple[List[str], asyncio.Future]] = []
+        self._pending_words = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="transphonator-batch"
+        )
+
+    async def transphonate(self, words: List[str]) -> List[Union[str, None]]:
+        """Transphonate the words of one request within the next batch."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((words, future))
+        self._pending_words += len(words)
+
+        if self._pending_words >= self.max_batch_size:
+            self._run_batch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._run_batch)
+        return await future
+
+    def _run_batch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        self._pending_words = 0
+        if not pending:
+            return
+
+        words = [
+            word for request_words, _ in pending for word in request_words
+        ]
+        self.batches_count += 1
+        batch = asyncio.get_running_loop().run_in_executor(
+            self._executor, self.pipeline.transphonate_batch, words
+        )
+        batch.add_done_callback(partial(self._set_results, pending))
+
+    @staticmethod
+    def _set_results(
+        pending: List[Tuple[List[str], asyncio.Future]],
+        batch: asyncio.Future,
+    ):
+        if batch.cancelled():
+            for _, future in pending:
+                future.cancel()
+            return
+
+        # The futures of requests whose client went away are already
+        # cancelled
+        error = batch.exception()
+        if error is not None:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        results = batch.result()
+        start = 0
+        for request_words, future in pending:
+            end = start + len(request_words)
+            if not future.done():
+                future.set_result(results[start:end])
+            start = end
+
+    def close(self):
+        """Wait for the running batch and stop the worker thread."""
+        self._executor.shutdown(wait=True)
+
+
+class LatencyTracker:
+    def __init__(self, window: int = 10000):
+        """Keep the latencies of the last `window` requests."""
+        self.latencies = deque(maxlen=window)
+        self.requests_count = 0
+
+    def add(self, latency: float):
+        self.latencies.append(latency)
+        self.requests_count += 1
+
+    def percentiles(self) -> Dict[str, float]:
+        """Get the p50/p90/p99 latencies, in milliseconds."""
+        if not self.latencies:
+            return {}
+        latencies = sorted(self.latencies)
+        last_idx = len(latencies) - 1
+        return {
+            f"p{q}": 1000 * latencies[round(q / 100 * last_idx)]
+            for q in (50, 90, 99)
+        }
+
+
+class TranslitServer:
+    def __init__(
+        self,
+        pipeline: BaseTransliterator,
+        max_batch_size: int = 512,
+        max_delay: float = 0.002,
+    ):
+        """Initialize the TranslitServer, a small HTTP/1.1 JSON service over
+        a loaded pipeline.
+
+        Endpoints:
+            GET /transphonate?word=<word>: transphonate one word.
+            POST /transphonate with a JSON body {"words": [...]}: transphonate
+                many words.
+            GET /stats: request count, batch count and latency percentiles.
+
+        Args:
+            pipeline (BaseTransliterator): The transliteration pipeline.
+            max_batch_size (int, optional): See `MicroBatcher`.
+            max_delay (float, optional): See `MicroBatcher`.
+        """
+        self.batcher = MicroBatcher(pipeline, max_batch_size, max_delay)
+        self.latency = LatencyTracker()
+
+    async def handle_request(
+        self, method: str, target: str, body: bytes
+    ) -> Tuple[int, dict]:
+        """Route a request and get its status code and JSON response."""
+        url = urlsplit(target)
+        if url.path == "/stats":
+            return 200, {
+                "requests": self.latency.requests_count,
+                "batches": self.batcher.batches_count,
+                "latency_ms": self.latency.percentiles(),
+            }
+        if url.path != "/transphonate":
+            return 404, {"error": f"Unknown path: {url.path}"}
+
+        if method == "GET":
+            words = parse_qs(url.query).get("word")
+            if not words:
+                return 400, {"error": "Missing `word` parameter"}
+            transliteration = (await self.batcher.transphonate(words[:1]))[0]
+            return 200, {"word": words[0], "transliteration": transliteration}
+
+        if method == "POST":
+            try:
+                words = json.loads(body)["words"]
+            except (ValueError, KeyError, TypeError):
+                return 400, {"error": 'Expected a JSON body {"words": [...]}'}
+            if not isinstance(words, list) or not all(
+                isinstance(word, str) for word in words
+            ):
+                return 400, {"error": "`words` must be a list of strings"}
+            transliterations = await self.batcher.transphonate(words)
+            return 200, {
+                "results": [
+                    {"word": word, "transliteration": transliteration}
+                    for word, transliteration in zip(words, transliterations)
+                ]
+            }
+
+        return 405, {"error": f"Method not allowed: {method}"}
+
+    @staticmethod
+    async def write_response(
+        writer: asyncio.StreamWriter,
+        status: int,
+        response: dict,
+        keep_alive: bool,
+    ):
+        """Write a JSON response."""
+        response_body = json.dumps(response, ensure_ascii=False)
+        response_body = response_body.encode("utf-8")
+        connection = "keep-alive" if keep_alive else "close"
+        writer.write(
+            (
+                f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\n"
+                "Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(response_body)}\r\n"
+                f"Connection: {connection}\r\n\r\n"
+            ).encode("ascii")
+            + response_body
+        )
+        await writer.drain()
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Serve the requests of a (keep-alive) connection. A malformed
+        request gets a 400 response and closes the connection, as the end of
+        the request cannot be found."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                start_time = time.perf_counter()
+                try:
+                    method, target, version = request_line.decode().split()
+                except ValueError:
+                    await self.write_response(
+                        writer, 400, {"error": "Malformed request line"}, False
+                    )
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    content_length = int(headers.get("content-length", 0))
+                    if content_length < 0:
+                        raise ValueError(content_length)
+                except ValueError:
+                    await self.write_response(
+                        writer, 400, {"error": "Malformed Content-Length"},
+                        False,
+                    )
+                    break
+                body = await reader.readexactly(content_length)
+
+                try:
+                    status, response = await self.handle_request(
+                        method, target, body
+                    )
+                except Exception as error:
+                    status, response = 500, {"error": str(error)}
+                keep_alive = (
+                    version == "HTTP/1.1"
+                    and headers.get("connection", "").lower() != "close"
+                )
+
+                await self.write_response(writer, status, response, keep_alive)
+                self.latency.add(time.perf_counter() - start_time)
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8080):
+        """Serve requests until cancelled."""
+        server = await asyncio.start_server(
+            self.handle_connection, host, port
+        )
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.batcher.close()
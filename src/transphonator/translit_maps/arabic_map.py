@@ -3,7 +3,26 @@ Reference:
 https://github.com/AMR-KELEG/English-to-arabic-transphonator/tree/master
 """
 
+from typing import List
+
 from transphonator.translit_maps.base_map import BaseTranslitMap
+from transphonator.utils.cache import get_fingerprint
+
+# ARPAbet symbols; vowels also appear with a stress marker (0, 1 or 2)
+ARPABET_VOWELS = [
+    'AA', 'AE', 'AH', 'AO', 'AW', 'AX', 'AXR', 'AY', 'EH', 'ER', 'EY', 'IH',
+    'IX', 'IY', 'OW', 'OY', 'UH', 'UW', 'UX'
+    ]
+ARPABET_CONSONANTS = [
+    'B', 'CH', 'D', 'DH', 'DX', 'EL', 'EM', 'EN', 'F', 'G', 'HH', 'JH', 'K',
+    'L', 'M', 'N', 'NG', 'NX', 'P', 'PH', 'Q', 'R', 'S', 'SH', 'T', 'TH', 'V',
+    'W', 'WH', 'Y', 'Z', 'ZH'
+    ]
+ARPABET_SYMBOLS = (
+    ARPABET_CONSONANTS
+    + ARPABET_VOWELS
+    + [vowel + stress for vowel in ARPABET_VOWELS for stress in '012']
+)
 
 
 class TranslitMapAra(BaseTranslitMap):
@@ -25,6 +44,20 @@ class TranslitMapAra(BaseTranslitMap):
             ]
         self.transliteration_map = dict(zip(phonemes, arabic_equivalent))
 
+        # Resolution table: phoneme -> Arabic equivalent, precomputed for
+        # every ARPAbet symbol. Unknown phonemes are added on first lookup.
+        self._sorted_phonemes = sorted(self.transliteration_map.keys())
+        self._equivalents = {
+            phoneme: self._resolve_equivalent(phoneme)
+            for phoneme in ARPABET_SYMBOLS + self._sorted_phonemes
+        }
+
+    def fingerprint(self) -> str:
+        """Hash of the phoneme to Arabic mapping table."""
+        return get_fingerprint(
+            [type(self).__name__, sorted(self.transliteration_map.items())]
+        )
+
     def _common_prefix(self, s1, s2):
         """
         Calculate the length of the common prefix between two strings.
@@ -44,20 +77,21 @@ class TranslitMapAra(BaseTranslitMap):
                 break
         return match_length
 
-    def get_equivalent(self, phoneme: str) -> str:
+    def _resolve_equivalent(self, phoneme: str) -> str:
         """
-        Find the closest Arabic equivalent for a given ARPAbet phoneme.
+        Resolve the Arabic equivalent of a phoneme using the map key that has
+        the longest common prefix with it. Ties go to the first key in sorted
+        order.
 
         Args:
-            phoneme (str): The ARPAbet phoneme to convert.
+            phoneme (str): The ARPAbet phoneme to resolve.
 
         Returns:
             str: The corresponding Arabic character(s).
         """
-        available_phonemes = sorted(self.transliteration_map.keys())
         matching_prefix_chars = [
             self._common_prefix(phoneme, trans_phoneme)
-            for trans_phoneme in available_phonemes
+            for trans_phoneme in self._sorted_phonemes
         ]
 
         # Find the index of the maximum prefix match
@@ -66,4 +100,46 @@ class TranslitMapAra(BaseTranslitMap):
             key=lambda i: matching_prefix_chars[i],
         )
 
-        return self.transliteration_map[available_phonemes[max_idx]]
+        return self.transliteration_map[self._sorted_phonemes[max_idx]]
+
+    def get_equivalent(self, phoneme: str) -> str:
+        """
+        Find the closest Arabic equivalent for a given ARPAbet phoneme.
+
+        Args:
+            phoneme (str): The ARPAbet phoneme to convert.
+
+        Returns:
+            str: The corresponding Arabic character(s).
+        """
+        equivalent = self._equivalents.get(phoneme)
+        if equivalent is None:
+            equivalent = self._resolve_equivalent(phoneme)
+            self._equivalents[phoneme] = equivalent
+        return equivalent
+
+    def get_equivalents_batch(
+        self, phonemes_list: List[List[str]]
+    ) -> List[str]:
+        """
+        Map each phoneme sequence to the joined Arabic equivalents, with one
+        lookup in the resolution table per phoneme.
+
+        Args:
+            phonemes_list (List[List[str]]): The ARPAbet phoneme sequences.
+
+        Returns:
+            List[str]: The corresponding Arabic characters of each sequence.
+        """
+        get_equivalent = self._equivalents.__getitem__
+        try:
+            return [
+                "".join(map(get_equivalent, phonemes))
+                for phonemes in phonemes_list
+            ]
+        except KeyError:
+            # Unknown phonemes are resolved once, then the batch is retried
+            for phonemes in phonemes_list:
+                for phoneme in phonemes:
+                    self.get_equivalent(phoneme)
+            return self.get_equivalents_batch(phonemes_list)
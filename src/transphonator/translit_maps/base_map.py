@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List
 
 
 class BaseTranslitMap(ABC):
@@ -6,3 +7,17 @@ class BaseTranslitMap(ABC):
     def get_equivalent(self, phoneme: str) -> str:
         """Retrieve the equivalent character for a given phoneme."""
         pass
+
+    def fingerprint(self) -> str:
+        """Version of the mapping, which changes when the mapping changes."""
+        return type(self).__name__
+
+    def get_equivalents_batch(
+        self, phonemes_list: List[List[str]]
+    ) -> List[str]:
+        """Map each phoneme sequence to the joined equivalent characters."""
+        get_equivalent = self.get_equivalent
+        return [
+            "".join([get_equivalent(phoneme) for phoneme in phonemes])
+            for phonemes in phonemes_list
+        ]
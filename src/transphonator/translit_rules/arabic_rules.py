@@ -4,8 +4,10 @@ https://github.com/AMR-KELEG/English-to-arabic-transphonator/tree/master
 """
 
 import re
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from transphonator.translit_rules.base_rules import BaseTranslitRule
+from transphonator.utils.cache import get_fingerprint
 
 
 class TranslitRuleAra(BaseTranslitRule):
@@ -17,6 +19,13 @@ class TranslitRuleAra(BaseTranslitRule):
             "\u0650": "ي",  # Kasra to Ya
         }
 
+        # Mapping of starting short vowels to hamza
+        self.short_vowel_to_hamza_dict = {
+            "\u064E": "أ",  # Fatha to Alef with hamza above
+            "\u064F": "أ",  # Damma to Alef with hamza above
+            "\u0650": "إ",  # Kasra to Alef with hamza below
+        }
+
         # Arabic character sets
         self.arabic_consonants = ["ب", "ت", "ث", "ج", "ح", "د", "ذ", "ر", "ز",
                                   "س", "ش", "غ", "ف", "ق", "ك", "ل", "م", "ن",
@@ -26,6 +35,85 @@ class TranslitRuleAra(BaseTranslitRule):
         # Fatha, Damma, Kasra (short vowels)
         self.arabic_short_vowels = ["\u064E", "\u064F", "\u0650"]
 
+        arabic_vowels_str = re.escape("".join(self.arabic_vowels))
+        arabic_consonants_str = re.escape("".join(self.arabic_consonants))
+        arabic_short_vowels_str = re.escape("".join(self.arabic_short_vowels))
+
+        # Character tables the rule replacements map characters through
+        self.char_tables = {
+            "short_vowel_to_hamza": self.short_vowel_to_hamza_dict,
+            "short_to_long_vowel": self.short_to_long_vowel_dict,
+        }
+
+        # Rule table: (name, pattern, replacement). A replacement is either
+        # the text that replaces the match, or a tuple with, for each matched
+        # character, the name of the character table it is mapped through
+        # (None keeps the character). All rules are applied in a single
+        # left-to-right pass, so a rule must not depend on the output of
+        # another rule; rules that do (e.g. rule 3 on top of rule 1) are
+        # merged into one entry. Earlier entries win when several rules match
+        # at the same position.
+        self.rules = [
+            # Rule 3 (on top of rule 1): Convert short vowels following a
+            # starting consonant to long vowels
+            (
+                "start_long_vowel",
+                f"^[\u064E\u064F{arabic_vowels_str}]"
+                f"[{arabic_consonants_str}][{arabic_short_vowels_str}]",
+                ("short_vowel_to_hamza", None, "short_to_long_vowel"),
+            ),
+            # Rule 1: Handle starting short vowels
+            (
+                "start_short_vowel",
+                f"^[{arabic_short_vowels_str}]",
+                ("short_vowel_to_hamza",),
+            ),
+            # Rule 2: Replace short vowels at the end
+            (
+                "end_short_vowel",
+                f"[{arabic_short_vowels_str}]$",
+                ("short_to_long_vowel",),
+            ),
+            # Rule 4: Handle 'ng' sound at the end
+            ("end_ng", "نق$", "نغ"),
+            # Rule 5: Handle 'ng' sound in the middle
+            ("middle_ng", f"نق(?=[{arabic_consonants_str}])", "ن"),
+        ]
+
+        # Compile the rule table into one pattern with a named group per rule
+        self._rules_regex = re.compile(
+            "|".join(
+                f"(?P<{name}>{pattern})" for name, pattern, _ in self.rules
+            )
+        )
+        # Rule name -> function from the matched text to its replacement
+        self.replacements: Dict[str, Callable[[str], str]] = {
+            name: self._compile_replacement(replacement)
+            for name, _, replacement in self.rules
+        }
+
+    def _compile_replacement(
+        self, replacement: Union[str, Tuple[Optional[str], ...]]
+    ) -> Callable[[str], str]:
+        if isinstance(replacement, str):
+            return lambda text: replacement
+
+        tables = [
+            self.char_tables[name] if name else {} for name in replacement
+        ]
+        return lambda text: "".join(
+            table.get(char, char) for table, char in zip(tables, text)
+        )
+
+    def fingerprint(self) -> str:
+        """Hash of the rule table and of the character tables it uses."""
+        return get_fingerprint(
+            [type(self).__name__, self.rules, self.char_tables]
+        )
+
+    def _replace(self, match: re.Match) -> str:
+        return self.replacements[match.lastgroup](match.group())
+
     def apply(self, text: str) -> str:
         """Apply transliteration rules to adjust the Arabic text.
 
@@ -35,37 +123,17 @@ class TranslitRuleAra(BaseTranslitRule):
         Returns:
             str: The adjusted Arabic transliteration.
         """
-        arabic_vowels_str = re.escape("".join(self.arabic_vowels))
-        arabic_consonants_str = re.escape("".join(self.arabic_consonants))
-        arabic_short_vowels_str = re.escape("".join(self.arabic_short_vowels))
+        return self._rules_regex.sub(self._replace, text)
 
-        # Rule 1: Handle starting Fatha
-        text = re.sub("^[\u064E\u064F]", "أ", text)
-        text = re.sub("^[\u0650]", "إ", text)
-
-        # Rule 2: Replace short vowels at the end
-        text = re.sub(
-            r"[\u064E\u064F\u0650]$",
-            lambda m: self.short_to_long_vowel_dict[m.group()],
-            text,
-        )
+    def apply_batch(self, texts: List[str]) -> List[str]:
+        """Apply transliteration rules to a list of Arabic texts.
 
-        # Rule 3: Convert short vowels following consonants to long vowels
-        groups = re.search(
-            f"^([{arabic_vowels_str}][{arabic_consonants_str}])([{arabic_short_vowels_str}])",
-            text,
-        )
-        if groups:
-            text = (
-                groups.group(1)
-                + self.short_to_long_vowel_dict[groups.group(2)]
-                + text[3:]
-            )
-
-        # Rule 4: Handle 'ng' sound at the end
-        text = re.sub(r"نق$", "نغ", text)
-
-        # Rule 5: Handle 'ng' sound in the middle
-        text = re.sub(r"نق(?=[{0}])".format(arabic_consonants_str), "ن", text)
+        Args:
+            texts (List[str]): The initial Arabic transliterations.
 
-        return text
+        Returns:
+            List[str]: The adjusted Arabic transliterations, in order.
+        """
+        sub = self._rules_regex.sub
+        replace = self._replace
+        return [sub(replace, text) for text in texts]
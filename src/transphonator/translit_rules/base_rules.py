@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import List
 
 
 class BaseTranslitRule(ABC):
@@ -6,3 +7,11 @@ class BaseTranslitRule(ABC):
     def apply(self, text: str) -> str:
         """Apply the rule to the given text and return the modified text."""
         pass
+
+    def fingerprint(self) -> str:
+        """Version of the rules, which changes when the rules change."""
+        return type(self).__name__
+
+    def apply_batch(self, texts: List[str]) -> List[str]:
+        """Apply the rule to a list of texts, in the same order."""
+        return [self.apply(text) for text in texts]
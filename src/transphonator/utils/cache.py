@@ -0,0 +1,92 @@
+import hashlib
+import json
+import marshal
+import os
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+CACHE_SUFFIX = ".cache"
+CACHE_FORMAT_VERSION = 1
+
+
+def get_source_stamp(source_path: str) -> Tuple[int, int]:
+    """Get the modification time (ns) and size of a source file. A cache
+    built from the file is valid as long as the stamp is unchanged.
+    """
+    stat = os.stat(source_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_sources_stamps(
+    source_paths: Iterable[Optional[str]],
+) -> List[List[int]]:
+    """Get the stamps of the existing files among `source_paths`, e.g. the
+    dictionaries a retriever is loaded from. Missing or None paths are
+    skipped, as the retrievers treat them as empty.
+    """
+    return [
+        list(get_source_stamp(path))
+        for path in source_paths
+        if path and os.path.isfile(path)
+    ]
+
+
+def get_fingerprint(obj: Any) -> str:
+    """Get a short stable hash of JSON-serializable data, used to version
+    caches on the content of the tables they depend on.
+    """
+    obj_json = json.dumps(obj, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(obj_json.encode("utf-8")).hexdigest()[:16]
+
+
+def write_atomic(path: str, data: bytes):
+    """Write `data` to `path` through a temporary file and a rename, so that
+    readers never see a partially written file.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as file_obj:
+            file_obj.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_cached(source_path: str, loader: Callable[[str], Any]) -> Any:
+    """Load a source file through `loader`, reusing a compiled snapshot.
+
+    The snapshot is a `marshal` dump written next to the source file
+    (`<source_path>.cache`). It is rebuilt when the source file modification
+    time or size changes. If the snapshot cannot be written (e.g. read-only
+    directory), the loaded data is returned without caching.
+
+    Args:
+        source_path (str): Path of the source file.
+        loader (Callable[[str], Any]): Function that parses the source file.
+            Its result must be serializable by `marshal`.
+
+    Returns:
+        Any: The data returned by `loader`.
+    """
+    stamp = get_source_stamp(source_path)
+    cache_path = source_path + CACHE_SUFFIX
+
+    try:
+        # Reading the whole file first is several times faster than letting
+        # `marshal.load` pull it through the file object
+        with open(cache_path, "rb") as file_obj:
+            version, cached_stamp, data = marshal.loads(file_obj.read())
+        if version == CACHE_FORMAT_VERSION and tuple(cached_stamp) == stamp:
+            return data
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    data = loader(source_path)
+    try:
+        write_atomic(
+            cache_path, marshal.dumps((CACHE_FORMAT_VERSION, stamp, data))
+        )
+    except OSError:
+        pass
+
+    return data
@@ -2,6 +2,8 @@ import argparse
 import os
 from typing import Tuple
 
+from transphonator.utils.streaming import OUTPUT_FORMATS
+
 CMU_DICT_PATH = "cmudict-0.7b.txt"
 FALLBACK_DICT_PATH = "phonenems_en.txt"
 
@@ -22,18 +24,121 @@ def process_args():
         help="The base data absolute directory.",
     )
 
+    # Streaming mode arguments
+    parser.add_argument(
+        "-i",
+        "--input",
+        nargs="+",
+        default=None,
+        help=(
+            "Files to read the words from, one per line; '-' reads stdin. "
+            "If not given, a few example words are transphonated."
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default="-",
+        help="File to write the results to; '-' (default) writes stdout.",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="tsv",
+        help="Output format.",
+    )
+    parser.add_argument(
+        "-c",
+        "--column",
+        type=int,
+        default=None,
+        help="0-based index of the tab-separated input column of the words.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1024,
+        help="Number of words transphonated at once.",
+    )
+
+    parser.add_argument(
+        "-p",
+        "--phrases",
+        action="store_true",
+        help=(
+            "Treat inputs as phrases split on spaces, hyphens and "
+            "underscores, e.g. multi-word location names."
+        ),
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes used to transphonate the input.",
+    )
+
     # Parse the arguments
     args = parser.parse_args()
 
-    # Get the base directory from the arguments
-    data_dir: str = args.data_dir
+    # Ensure the base directory is valid
+    if not os.path.isdir(args.data_dir):
+        print(f"Error: {args.data_dir} is not a valid directory")
+        exit(1)
+
+    return args
+
+
+def process_server_args():
+    # Set up argument parser
+    parser = argparse.ArgumentParser(
+        description=(
+            "Local HTTP service for the transliterator from English based on "
+            "the English phonetic representation."
+        )
+    )
+
+    parser.add_argument(
+        "data_dir",
+        type=str,
+        help="The base data absolute directory.",
+    )
+    parser.add_argument(
+        "--host",
+        type=str,
+        default="127.0.0.1",
+        help="Address to listen on.",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8080,
+        help="Port to listen on.",
+    )
+    parser.add_argument(
+        "--max-batch-size",
+        type=int,
+        default=512,
+        help="Number of words that triggers a micro-batch.",
+    )
+    parser.add_argument(
+        "--max-delay",
+        type=float,
+        default=2.0,
+        help="Maximum time (ms) a request waits to be batched.",
+    )
+
+    # Parse the arguments
+    args = parser.parse_args()
 
     # Ensure the base directory is valid
-    if not os.path.isdir(data_dir):
-        print(f"Error: {data_dir} is not a valid directory")
+    if not os.path.isdir(args.data_dir):
+        print(f"Error: {args.data_dir} is not a valid directory")
         exit(1)
 
-    return data_dir
+    return args
 
 
 def get_data_dir(base_data_dir: str) -> Tuple[str, str]:
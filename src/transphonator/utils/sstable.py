@@ -0,0 +1,184 @@
+"""Read-only sorted string table stored in a single memory-mapped file.
+
+Layout (all integers are little-endian):
+    header: magic (4 bytes), version (uint32), entries count (uint32),
+            metadata length (uint32)
+    metadata: JSON object, padded to a multiple of 8 bytes
+    key offsets: entries count + 1 uint32
+    value offsets: entries count + 1 uint32
+    keys: concatenated keys, sorted
+    values: concatenated values, in the keys order
+
+Lookups are a binary search over the memory-mapped keys, so opening a table
+costs almost nothing and its pages are shared between processes by the OS
+page cache.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from transphonator.utils.cache import write_atomic
+
+TABLE_MAGIC = b"TPST"
+TABLE_VERSION = 1
+HEADER_FORMAT = "<4sIII"
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+OFFSET_TYPECODE = "I"
+OFFSET_SIZE = 4
+
+if array(OFFSET_TYPECODE).itemsize != OFFSET_SIZE:
+    raise ImportError("Sorted string tables need 4 bytes unsigned ints")
+
+
+def _offsets_to_bytes(offsets: array) -> bytes:
+    if sys.byteorder == "big":
+        offsets = array(OFFSET_TYPECODE, offsets)
+        offsets.byteswap()
+    return offsets.tobytes()
+
+
+def _offsets_from_bytes(view: memoryview):
+    """Get the offsets stored in `view`, without copying them when the
+    machine is little-endian."""
+    if sys.byteorder == "little":
+        return view.cast(OFFSET_TYPECODE)
+    offsets = array(OFFSET_TYPECODE, view.tobytes())
+    offsets.byteswap()
+    view.release()
+    return offsets
+
+
+def write_table(
+    path: str,
+    items: Iterable[Tuple[bytes, bytes]],
+    metadata: Optional[Dict[str, Any]] = None,
+):
+    """Write key/value pairs into a sorted string table file.
+
+    Args:
+        path (str): Path of the table file. It is replaced atomically.
+        items (Iterable[Tuple[bytes, bytes]]): Key/value pairs. Keys must be
+            unique; they are sorted before writing.
+        metadata (Dict[str, Any], optional): JSON-serializable data stored in
+            the table header. Defaults to None.
+    """
+    items = sorted(items)
+    keys_offsets = array(OFFSET_TYPECODE, [0])
+    values_offsets = array(OFFSET_TYPECODE, [0])
+    for key, value in items:
+        keys_offsets.append(keys_offsets[-1] + len(key))
+        values_offsets.append(values_offsets[-1] + len(value))
+
+    metadata_bytes = json.dumps(metadata or {}).encode("utf-8")
+    metadata_bytes += b" " * (-(HEADER_SIZE + len(metadata_bytes)) % 8)
+
+    data = b"".join(
+        [
+            struct.pack(
+                HEADER_FORMAT,
+                TABLE_MAGIC,
+                TABLE_VERSION,
+                len(items),
+                len(metadata_bytes),
+            ),
+            metadata_bytes,
+            _offsets_to_bytes(keys_offsets),
+            _offsets_to_bytes(values_offsets),
+            b"".join(key for key, _ in items),
+            b"".join(value for _, value in items),
+        ]
+    )
+    write_atomic(path, data)
+
+
+class _TableKeys:
+    """Sequence view over the sorted keys, used for binary search."""
+
+    def __init__(self, table: "SortedStringTable"):
+        self._table = table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, idx: int) -> bytes:
+        return self._table.key_at(idx)
+
+
+class SortedStringTable:
+    def __init__(self, path: str):
+        """Open a sorted string table file written by `write_table`.
+
+        Args:
+            path (str): Path of the table file.
+
+        Raises:
+            ValueError: If the file is not a sorted string table.
+        """
+        self.path = path
+        with open(path, "rb") as file_obj:
+            self._mmap = mmap.mmap(
+                file_obj.fileno(), 0, access=mmap.ACCESS_READ
+            )
+
+        magic, version, count, metadata_size = struct.unpack_from(
+            HEADER_FORMAT, self._mmap
+        )
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a sorted string table")
+
+        self._count = count
+        offsets_start = HEADER_SIZE + metadata_size
+        offsets_size = OFFSET_SIZE * (count + 1)
+        self.metadata: Dict[str, Any] = json.loads(
+            self._mmap[HEADER_SIZE:offsets_start]
+        )
+
+        view = memoryview(self._mmap)
+        self._keys_offsets = _offsets_from_bytes(
+            view[offsets_start:offsets_start + offsets_size]
+        )
+        self._values_offsets = _offsets_from_bytes(
+            view[offsets_start + offsets_size:offsets_start + 2 * offsets_size]
+        )
+        self._keys_start = offsets_start + 2 * offsets_size
+        self._values_start = self._keys_start + self._keys_offsets[count]
+        self._keys = _TableKeys(self)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: bytes) -> bool:
+        return self.get(key) is not None
+
+    def key_at(self, idx: int) -> bytes:
+        start = self._keys_start + self._keys_offsets[idx]
+        end = self._keys_start + self._keys_offsets[idx + 1]
+        return self._mmap[start:end]
+
+    def value_at(self, idx: int) -> bytes:
+        start = self._values_start + self._values_offsets[idx]
+        end = self._values_start + self._values_offsets[idx + 1]
+        return self._mmap[start:end]
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        """Get the value of a key, or None if the key is not in the table."""
+        idx = bisect_left(self._keys, key)
+        if idx < self._count and self.key_at(idx) == key:
+            return self.value_at(idx)
+        return None
+
+    def items(self) -> Iterable[Tuple[bytes, bytes]]:
+        for idx in range(self._count):
+            yield self.key_at(idx), self.value_at(idx)
+
+    def close(self):
+        for offsets in (self._keys_offsets, self._values_offsets):
+            if isinstance(offsets, memoryview):
+                offsets.release()
+        self._mmap.close()
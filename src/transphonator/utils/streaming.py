@@ -0,0 +1,82 @@
+import fileinput
+import json
+from itertools import tee
+from typing import IO, Iterable, Iterator, List, Optional
+
+from transphonator.pipeline.base_transliterator import BaseTransliterator
+
+NO_PHONEMES_ERROR = "no_phonemes"
+OUTPUT_FORMATS = ("tsv", "jsonl")
+
+
+def read_words(
+    input_paths: List[str], column: Optional[int] = None
+) -> Iterator[str]:
+    """Lazily read words from files or stdin, one word per line.
+
+    Args:
+        input_paths (List[str]): Paths of the input files; "-" reads stdin.
+        column (int, optional): 0-based index of the tab-separated column
+        that holds the word. Defaults to None, the whole line is the word.
+
+    Yields:
+        str: The words, in the input order. Empty lines are skipped.
+    """
+    with fileinput.input(files=input_paths, encoding="utf-8") as lines:
+        for line in lines:
+            word = line.rstrip("\r\n")
+            if column is not None:
+                fields = word.split("\t")
+                word = fields[column] if column < len(fields) else ""
+            word = word.strip()
+            if word:
+                yield word
+
+
+def format_result(
+    word: str, transliteration: Optional[str], output_format: str
+) -> str:
+    """Format the transliteration of a word as a TSV or JSONL line."""
+    error = NO_PHONEMES_ERROR if transliteration is None else None
+    if output_format == "jsonl":
+        return json.dumps(
+            {"word": word, "transliteration": transliteration, "error": error},
+            ensure_ascii=False,
+        )
+    return f"{word}\t{transliteration or ''}\t{error or ''}"
+
+
+def stream_transphonate(
+    pipeline: BaseTransliterator,
+    words: Iterable[str],
+    output: IO[str],
+    output_format: str = "tsv",
+    chunk_size: int = 1024,
+):
+    """Transphonate words chunk by chunk and write the results as they are
+    computed, so memory use does not depend on the input size.
+
+    Args:
+        pipeline (BaseTransliterator): The transliteration pipeline.
+        words (Iterable[str]): The words to transphonate.
+        output (IO[str]): The text stream to write the results to.
+        output_format (str, optional): "tsv" (with a header line) or "jsonl".
+        Defaults to "tsv".
+        chunk_size (int, optional): Number of words transphonated at once.
+        Defaults to 1024.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if output_format == "tsv":
+        output.write("word\ttransliteration\terror\n")
+
+    words, words_to_write = tee(words)
+    transliterations = pipeline.transphonate_iter(words, chunk_size)
+    for i, (word, transliteration) in enumerate(
+        zip(words_to_write, transliterations), 1
+    ):
+        output.write(format_result(word, transliteration, output_format))
+        output.write("\n")
+        if i % chunk_size == 0:
+            output.flush()
+    output.flush()
@@ -0,0 +1,57 @@
+"""
+Differential check of the transducer backend against the two-stage
+(map then rules) pipeline over the whole CMU and fallback vocabulary.
+
+Example:
+    python verify_transducer.py <data_dir>
+"""
+
+import sys
+
+from transphonator.phoneme.cmu_retriever import CMURetriever
+from transphonator.pipeline.transducer_transliterator import (
+    TransducerTranslitPipeline,
+    TranslitTransducer,
+)
+from transphonator.pipeline.transliterator import TranslitPipeline
+from transphonator.translit_maps.arabic_map import TranslitMapAra
+from transphonator.translit_rules.arabic_rules import TranslitRuleAra
+from transphonator.utils.paths import get_data_dir, process_args
+
+if __name__ == "__main__":
+
+    args = process_args()
+    cmu_dict_path, fallback_dict_path = get_data_dir(args.data_dir)
+
+    retriever = CMURetriever(cmu_dict_path, fallback_dict_path)
+    transliteration_map_ar = TranslitMapAra()
+    transliteration_rules_ar = TranslitRuleAra()
+
+    two_stage_pipeline = TranslitPipeline(
+        retriever, transliteration_map_ar, transliteration_rules_ar
+    )
+    transducer_pipeline = TransducerTranslitPipeline(
+        retriever,
+        TranslitTransducer(transliteration_map_ar, transliteration_rules_ar),
+    )
+
+    words = list(
+        dict.fromkeys(
+            list(retriever.english_word_to_phoneme)
+            + list(retriever.fallback_dict)
+        )
+    )
+    expected = two_stage_pipeline.transphonate_batch(words)
+    actual = transducer_pipeline.transphonate_batch(words)
+
+    mismatches = [
+        (word, expected_output, actual_output)
+        for word, expected_output, actual_output in zip(
+            words, expected, actual
+        )
+        if expected_output != actual_output
+    ]
+    for word, expected_output, actual_output in mismatches[:20]:
+        print(f"{word}\t{expected_output}\t{actual_output}")
+    print(f"{len(mismatches)} mismatches out of {len(words)} words")
+    sys.exit(1 if mismatches else 0)
@@ -0,0 +1,17 @@
+from transphonator.translit_maps.arabic_map import TranslitMapAra
+from transphonator.translit_maps.base_map import BaseTranslitMap
+
+
+def test_batch_matches_per_phoneme_mapping():
+    phonemes_list = [
+        ["HH", "AH0", "L", "OW1"],
+        [],
+        ["NG", "AXR2", "XX9"],  # unknown phonemes are resolved on the fly
+        ["XX9", "B"],
+    ]
+
+    expected = BaseTranslitMap.get_equivalents_batch(
+        TranslitMapAra(), phonemes_list
+    )
+
+    assert TranslitMapAra().get_equivalents_batch(phonemes_list) == expected
@@ -0,0 +1,71 @@
+import os
+
+from transphonator.phoneme.cmu_retriever import CMURetriever
+from transphonator.utils.cache import CACHE_SUFFIX, load_cached
+
+CMU_DICT = """;;; comment
+HELLO  HH AH0 L OW1
+WORLD  W ER1 L D
+"""
+
+
+def write_dict(path, text, mtime_ns=None):
+    path.write_text(text, encoding="ISO-8859-1")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_load_cached_reuses_snapshot(tmp_path):
+    source = tmp_path / "cmudict.txt"
+    write_dict(source, CMU_DICT)
+    calls = []
+
+    def loader(path):
+        calls.append(path)
+        return CMURetriever.parse_cmudict(path)
+
+    first = load_cached(str(source), loader)
+    second = load_cached(str(source), loader)
+
+    assert first == second == {
+        "hello": ["HH", "AH", "L", "OW"],
+        "world": ["W", "ER", "L", "D"],
+    }
+    assert len(calls) == 1
+    assert os.path.isfile(str(source) + CACHE_SUFFIX)
+
+
+def test_load_cached_rebuilds_when_source_changes(tmp_path):
+    source = tmp_path / "cmudict.txt"
+    write_dict(source, CMU_DICT, mtime_ns=1_000_000_000)
+    load_cached(str(source), CMURetriever.parse_cmudict)
+
+    write_dict(source, CMU_DICT + "NEW  N UW1\n", mtime_ns=2_000_000_000)
+    data = load_cached(str(source), CMURetriever.parse_cmudict)
+
+    assert data["new"] == ["N", "UW"]
+
+
+def test_load_cached_ignores_corrupt_snapshot(tmp_path):
+    source = tmp_path / "cmudict.txt"
+    write_dict(source, CMU_DICT)
+    (tmp_path / ("cmudict.txt" + CACHE_SUFFIX)).write_bytes(b"\x00garbage")
+
+    data = load_cached(str(source), CMURetriever.parse_cmudict)
+
+    assert data == CMURetriever.parse_cmudict(str(source))
+
+
+def test_cmu_retriever_cache_matches_parsing(tmp_path):
+    source = tmp_path / "cmudict.txt"
+    write_dict(source, CMU_DICT)
+    fallback = tmp_path / "fallback.txt"
+    fallback.write_text("naruhito N AA R UW HH IY T OW\n", encoding="utf-8")
+
+    uncached = CMURetriever(str(source), str(fallback), use_cache=False)
+    CMURetriever(str(source), str(fallback))  # writes the snapshots
+    cached = CMURetriever(str(source), str(fallback))
+
+    assert cached.english_word_to_phoneme == uncached.english_word_to_phoneme
+    assert cached.fallback_dict == uncached.fallback_dict
+    assert cached.get_phonemes("Naruhito") == uncached.get_phonemes("naruhito")
@@ -0,0 +1,118 @@
+import os
+
+from transphonator.phoneme.cmu_retriever import CMURetriever
+from transphonator.pipeline.cached_transliterator import (
+    CachedTranslitPipeline,
+)
+from transphonator.pipeline.transliterator import TranslitPipeline
+from transphonator.translit_maps.arabic_map import TranslitMapAra
+from transphonator.translit_rules.arabic_rules import TranslitRuleAra
+
+CMU_DICT = """HELLO  HH AH0 L OW1
+WORLD  W ER1 L D
+SING  S IH1 NG
+"""
+
+
+def write_dict(path, text, mtime_ns):
+    path.write_text(text, encoding="ISO-8859-1")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def make_pipeline(cmu_path, rules=None):
+    return TranslitPipeline(
+        CMURetriever(str(cmu_path), use_cache=False),
+        TranslitMapAra(),
+        rules or TranslitRuleAra(),
+    )
+
+
+def test_rules_fingerprint_covers_replacements():
+    rules = TranslitRuleAra()
+    changed = TranslitRuleAra()
+    changed.rules = [
+        (name, pattern, "نك" if name == "end_ng" else replacement)
+        for name, pattern, replacement in changed.rules
+    ]
+    changed_table = TranslitRuleAra()
+    changed_table.short_to_long_vowel_dict["َ"] = "ا"
+
+    assert rules.fingerprint() == TranslitRuleAra().fingerprint()
+    assert changed.fingerprint() != rules.fingerprint()
+    assert changed_table.fingerprint() != rules.fingerprint()
+
+
+def test_retriever_fingerprint_covers_dictionary_stamps(tmp_path):
+    cmu_path = tmp_path / "cmudict.txt"
+    write_dict(cmu_path, CMU_DICT, 1_000_000_000)
+    before = CMURetriever(str(cmu_path), use_cache=False).fingerprint()
+
+    write_dict(cmu_path, CMU_DICT, 2_000_000_000)
+    after = CMURetriever(str(cmu_path), use_cache=False).fingerprint()
+
+    assert before != after
+
+
+def test_cache_invalidated_by_dictionary_change(tmp_path):
+    cmu_path = tmp_path / "cmudict.txt"
+    cache_path = str(tmp_path / "cache.sqlite")
+    write_dict(cmu_path, CMU_DICT, 1_000_000_000)
+    cached = CachedTranslitPipeline(make_pipeline(cmu_path), cache_path)
+    old = cached.transphonate("hello")
+    cached.close()
+
+    write_dict(
+        cmu_path, CMU_DICT.replace("HH AH0", "Y EH1"), 2_000_000_000
+    )
+    pipeline = make_pipeline(cmu_path)
+    cached = CachedTranslitPipeline(pipeline, cache_path)
+    new = cached.transphonate("hello")
+    cached.close()
+
+    assert new == pipeline.transphonate("hello") != old
+    assert cached.stats == {"hits": 0, "misses": 1}
+
+
+def test_cache_reused_when_unchanged(tmp_path):
+    cmu_path = tmp_path / "cmudict.txt"
+    cache_path = str(tmp_path / "cache.sqlite")
+    write_dict(cmu_path, CMU_DICT, 1_000_000_000)
+    words = ["hello", "world", "sing", "unknown"]
+    cached = CachedTranslitPipeline(make_pipeline(cmu_path), cache_path)
+    first = cached.transphonate_batch(words)
+    cached.close()
+
+    cached = CachedTranslitPipeline(make_pipeline(cmu_path), cache_path)
+    second = cached.transphonate_batch(words)
+    cached.close()
+
+    assert first == second == make_pipeline(cmu_path).transphonate_batch(
+        words
+    )
+    assert cached.stats == {"hits": 4, "misses": 0}
+
+
+def test_eviction_keeps_last_words_of_batch(tmp_path):
+    cmu_path = tmp_path / "cmudict.txt"
+    cache_path = str(tmp_path / "cache.sqlite")
+    words = [f"word{i}" for i in range(50)]
+    write_dict(
+        cmu_path,
+        "".join(f"{word.upper()}  W ER1 D\n" for word in words),
+        1_000_000_000,
+    )
+    cached = CachedTranslitPipeline(
+        make_pipeline(cmu_path), cache_path, max_entries=20
+    )
+    cached.transphonate_batch(words)
+    # The rows hit by this batch must survive the insert of word0
+    cached.transphonate_batch(words[-10:] + ["word0"])
+    cached.close()
+
+    cached = CachedTranslitPipeline(
+        make_pipeline(cmu_path), cache_path, max_entries=20
+    )
+    cached.transphonate_batch(words[-10:])
+    cached.close()
+
+    assert cached.stats == {"hits": 10, "misses": 0}
@@ -0,0 +1,160 @@
+import difflib
+import random
+from pathlib import Path
+
+import pytest
+
+import alignment
+from alignment import get_opcodes, get_text_opcodes
+from metrics_calc import calculate_metrics, count_diffs, process_files
+
+ARTICLES_DIR = Path(__file__).resolve().parents[1] / "data/raw/articles"
+
+
+def legacy_count_diffs(reference, generated):
+    """count_diffs as first written, on difflib.SequenceMatcher."""
+    s = difflib.SequenceMatcher(None, list(generated), list(reference))
+    insertions = deletions = matches = edits = 0
+    for tag, i1, i2, j1, j2 in s.get_opcodes():
+        if tag == "insert":
+            insertions += len(reference[j1:j2])
+        elif tag == "delete":
+            deletions += len(generated[i1:i2])
+        elif tag == "replace":
+            edits += len(generated[i1:i2])
+        else:
+            matches += len(generated[i1:i2])
+    return insertions, deletions, edits, matches
+
+
+def lcs_length(a, b):
+    previous = [0] * (len(b) + 1)
+    for char in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(
+                previous[j] + 1
+                if char == other
+                else max(previous[j + 1], current[j])
+            )
+        previous = current
+    return previous[-1]
+
+
+def random_pairs(count, alphabet="abcd ", max_size=30):
+    rng = random.Random(0)
+    for _ in range(count):
+        yield (
+            "".join(rng.choices(alphabet, k=rng.randint(0, max_size))),
+            "".join(rng.choices(alphabet, k=rng.randint(0, max_size))),
+        )
+
+
+def test_difflib_method_matches_legacy_implementation():
+    pairs = list(random_pairs(200, max_size=300))
+    pairs.append(process_files(str(ARTICLES_DIR)))
+
+    for reference, generated in pairs:
+        assert count_diffs(reference, generated, "difflib") == (
+            legacy_count_diffs(reference, generated)
+        )
+
+
+def test_legacy_metrics_on_articles():
+    golden_text, generated_text = process_files(str(ARTICLES_DIR))
+
+    edit_distance, _, accuracy = calculate_metrics(
+        golden_text, generated_text, "difflib"
+    )
+
+    assert edit_distance == 3031
+    assert round(accuracy, 6) == 0.646721
+
+
+def test_myers_alignment_is_optimal():
+    for a, b in random_pairs(300):
+        opcodes = get_opcodes(a, b)
+        matches = sum(
+            i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == "equal"
+        )
+        rebuilt = "".join(
+            a[i1:i2] if tag == "equal" else b[j1:j2]
+            for tag, i1, i2, j1, j2 in opcodes
+        )
+
+        assert matches == lcs_length(a, b)
+        assert rebuilt == b
+
+
+def random_text_pair(size, edit_rate, seed=0):
+    """A text of random words and a copy with `edit_rate` of its characters
+    replaced, deleted or inserted."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    vocabulary = [
+        "".join(rng.choices(letters, k=rng.randint(2, 8)))
+        for _ in range(size // 10)
+    ]
+    text = " ".join(rng.choices(vocabulary, k=size // 5))[:size]
+    edited = list(text)
+    for _ in range(int(size * edit_rate)):
+        i = rng.randrange(len(edited))
+        op = rng.random()
+        if op < 0.5:
+            edited[i] = rng.choice(letters + " ")
+        elif op < 0.75:
+            del edited[i]
+        else:
+            edited.insert(i, rng.choice(letters + " "))
+    return text, "".join(edited)
+
+
+def count_matches(opcodes):
+    return sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == "equal")
+
+
+def test_text_alignment_is_optimal_on_articles():
+    golden_text, generated_text = process_files(str(ARTICLES_DIR))
+
+    _, _, accuracy = calculate_metrics(golden_text, generated_text)
+
+    assert count_matches(
+        get_text_opcodes(generated_text, golden_text)
+    ) == count_matches(get_opcodes(generated_text, golden_text))
+    assert round(accuracy, 6) == 0.921718
+
+
+def test_text_alignment_scales(monkeypatch):
+    # The exact diff costs O((N + M)D), so the alignment stays linear as
+    # long as it only runs on spans of bounded size
+    span_sizes = []
+    myers_blocks = alignment._myers_blocks
+
+    def record_myers_blocks(a, alo, ahi, b, blo, bhi, blocks):
+        span_sizes.append(ahi - alo + bhi - blo)
+        myers_blocks(a, alo, ahi, b, blo, bhi, blocks)
+
+    monkeypatch.setattr(alignment, "_myers_blocks", record_myers_blocks)
+    a, b = random_text_pair(300_000, 0.1)
+    opcodes = get_text_opcodes(a, b)
+    rebuilt = "".join(
+        a[i1:i2] if tag == "equal" else b[j1:j2]
+        for tag, i1, i2, j1, j2 in opcodes
+    )
+
+    assert rebuilt == b
+    assert max(span_sizes) <= alignment.EXACT_SPAN_SIZE
+    assert count_matches(opcodes) > 0.85 * len(a)
+
+
+def test_word_anchors_keep_alignment_optimal():
+    a, b = random_text_pair(3_000, 0.12, seed=1)
+
+    assert count_matches(get_text_opcodes(a, b, exact_size=0)) == (
+        count_matches(get_opcodes(a, b))
+    )
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        count_diffs("a", "b", "levenshtein")
@@ -0,0 +1,45 @@
+from transphonator.phoneme.cascading_retriever import CascadingRetriever
+from transphonator.phoneme.cmu_retriever import CMURetriever
+from transphonator.pipeline.parallel_transliterator import (
+    ParallelTranslitPipeline,
+)
+from transphonator.pipeline.transliterator import TranslitPipeline
+from transphonator.translit_maps.arabic_map import TranslitMapAra
+from transphonator.translit_rules.arabic_rules import TranslitRuleAra
+
+CMU_DICT = """HELLO  HH AH0 L OW1
+WORLD  W ER1 L D
+"""
+
+
+def make_pipeline(cmu_path, fallback_path):
+    retriever = CascadingRetriever(
+        CMURetriever(str(cmu_path), str(fallback_path), use_cache=False)
+    )
+    return TranslitPipeline(retriever, TranslitMapAra(), TranslitRuleAra())
+
+
+def test_parallel_matches_serial_results_and_stats(tmp_path):
+    cmu_path = tmp_path / "cmudict.txt"
+    cmu_path.write_text(CMU_DICT, encoding="ISO-8859-1")
+    fallback_path = tmp_path / "fallback.txt"
+    fallback_path.write_text(
+        "naruhito N AA R UW HH IY T OW\n", encoding="utf-8"
+    )
+    words = ["hello", "naruhito", "unknown", "world"] * 25
+
+    # Batches count repeated words once, so run the same chunks serially
+    serial = make_pipeline(cmu_path, fallback_path)
+    expected = []
+    for start in range(0, len(words), 8):
+        expected += serial.transphonate_batch(words[start:start + 8])
+    pipeline = make_pipeline(cmu_path, fallback_path)
+    with ParallelTranslitPipeline(
+        pipeline, processes=2, chunk_size=8
+    ) as parallel:
+        results = parallel.transphonate_batch(words)
+
+    assert results == expected
+    assert pipeline.phoneme_retriever.get_stats() == (
+        serial.phoneme_retriever.get_stats()
+    )
@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from transphonator.phoneme.cmu_retriever import CMURetriever
+from transphonator.phoneme.lexicon_retriever import LexiconRetriever
+from transphonator.pipeline.precomputed_transliterator import (
+    PrecomputedTranslitPipeline,
+    build_translit_table,
+)
+from transphonator.pipeline.transliterator import TranslitPipeline
+from transphonator.translit_maps.arabic_map import TranslitMapAra
+from transphonator.translit_rules.arabic_rules import TranslitRuleAra
+
+CMU_DICT = """HELLO  HH AH0 L OW1
+WORLD  W ER1 L D
+"""
+
+
+def write_dict(path, text, mtime_ns):
+    path.write_text(text, encoding="ISO-8859-1")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def make_pipeline(retriever):
+    return TranslitPipeline(retriever, TranslitMapAra(), TranslitRuleAra())
+
+
+def test_table_matches_pipeline(tmp_path):
+    cmu_path = tmp_path / "cmudict.txt"
+    table_path = str(tmp_path / "words.translit")
+    write_dict(cmu_path, CMU_DICT, 1_000_000_000)
+    pipeline = make_pipeline(CMURetriever(str(cmu_path), use_cache=False))
+    build_translit_table(table_path, pipeline, ["hello", "world"])
+
+    # Any retriever over the same dictionaries can use the table
+    lexicon_pipeline = make_pipeline(
+        LexiconRetriever.from_dicts(str(cmu_path))
+    )
+    precomputed = PrecomputedTranslitPipeline(table_path, lexicon_pipeline)
+    words = ["Hello", "world", "unknown"]
+
+    assert precomputed.transphonate_batch(words) == (
+        pipeline.transphonate_batch(words)
+    )
+
+
+def test_table_rejected_when_dictionary_changes(tmp_path):
+    cmu_path = tmp_path / "cmudict.txt"
+    table_path = str(tmp_path / "words.translit")
+    write_dict(cmu_path, CMU_DICT, 1_000_000_000)
+    pipeline = make_pipeline(CMURetriever(str(cmu_path), use_cache=False))
+    build_translit_table(table_path, pipeline, ["hello", "world"])
+
+    write_dict(
+        cmu_path, CMU_DICT.replace("HH AH0", "Y EH1"), 2_000_000_000
+    )
+    pipeline = make_pipeline(CMURetriever(str(cmu_path), use_cache=False))
+
+    with pytest.raises(ValueError):
+        PrecomputedTranslitPipeline(table_path, pipeline)
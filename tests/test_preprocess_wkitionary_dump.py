@@ -0,0 +1,122 @@
+import gzip
+import json
+
+import pytest
+
+pytest.importorskip("pyarabic")
+
+import preprocess_wkitionary_dump as dump  # noqa: E402
+
+
+def make_entry(word, pos, data, etymology_number=None):
+    line = json.dumps({word: {"pos": pos, "data": data}})
+    return dump.DumpEntry(
+        "ar", word, pos, etymology_number, f"{word}-{pos}-{data}", line
+    )
+
+
+def extract(tmp_path, entries, incremental=False):
+    paths = [
+        tmp_path / "ar.jsonl",
+        tmp_path / "ar_offsets.json.gz",
+        tmp_path / "ar_fingerprints.sqlite",
+    ]
+    if incremental:
+        writer = dump.IncrementalDumpWriter(*paths, tmp_path / "delta.jsonl")
+    else:
+        writer = dump.ReindexedDumpWriter(*paths)
+    with writer:
+        for entry in entries:
+            writer.add(entry)
+    return writer
+
+
+def read_offsets(tmp_path):
+    with gzip.open(tmp_path / "ar_offsets.json.gz", "rt") as f:
+        return json.load(f)
+
+
+def test_offsets_spilled_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(dump, "SPILL_BATCH_SIZE", 2)
+    entries = [
+        make_entry("b", "noun", 1),
+        make_entry("a", "verb", 2),
+        make_entry("b", "verb", 3),
+        make_entry("c", "noun", 4),
+        make_entry("a", "noun", 5),
+    ]
+    extract(tmp_path, entries)
+
+    offsets = read_offsets(tmp_path)
+    assert list(offsets) == ["a", "b", "c"]
+    with open(tmp_path / "ar.jsonl", "rb") as f:
+        for word, word_offsets in offsets.items():
+            lines = []
+            for offset in word_offsets:
+                f.seek(offset)
+                lines.append(f.readline().decode("utf-8").rstrip("\n"))
+            assert lines == [e.line for e in entries if e.word == word]
+
+
+def test_incremental_delta(tmp_path, monkeypatch):
+    monkeypatch.setattr(dump, "SPILL_BATCH_SIZE", 2)
+    extract(
+        tmp_path,
+        [
+            make_entry("a", "noun", 1),
+            make_entry("a", "noun", 2),
+            make_entry("b", "verb", 3),
+            make_entry("c", "noun", 4),
+        ],
+    )
+    new_entries = [
+        make_entry("a", "noun", 2),
+        make_entry("a", "noun", 9),
+        make_entry("c", "noun", 4),
+        make_entry("d", "noun", 5),
+    ]
+    writer = extract(tmp_path, new_entries, incremental=True)
+
+    with open(tmp_path / "delta.jsonl", encoding="utf-8") as f:
+        delta = [json.loads(line) for line in f]
+    assert delta == [
+        {
+            "op": "change",
+            "key": ["a", "noun", None],
+            "entry": json.loads(new_entries[1].line),
+        },
+        {
+            "op": "add",
+            "key": ["d", "noun", None],
+            "entry": json.loads(new_entries[3].line),
+        },
+        {"op": "remove", "key": ["b", "verb", None]},
+    ]
+    assert writer.stats == {
+        "add": 1, "change": 1, "remove": 1, "unchanged": 2
+    }
+    assert list(read_offsets(tmp_path)) == ["a", "c", "d"]
+
+
+def test_legacy_outputs(tmp_path):
+    entries = [
+        make_entry("b", "noun", 1),
+        make_entry("a", "verb", 2),
+        make_entry("b", "verb", 3),
+    ]
+    legacy_dump_path = tmp_path / "ar-wiktextract-data.json.gz"
+    legacy_reindices_path = tmp_path / "ar_reindex.json.gz"
+    with dump.ReindexedDumpWriter(
+        tmp_path / "ar.jsonl",
+        tmp_path / "ar_offsets.json.gz",
+        tmp_path / "ar_fingerprints.sqlite",
+        legacy_dump_path,
+        legacy_reindices_path,
+    ) as writer:
+        for entry in entries:
+            writer.add(entry)
+
+    with gzip.open(legacy_dump_path, "rt", encoding="utf-8") as f:
+        assert f.read().splitlines() == [entry.line for entry in entries]
+    with gzip.open(legacy_reindices_path, "rt", encoding="utf-8") as f:
+        assert json.load(f) == {"a": [1], "b": [0, 2]}
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import threading
+import time
+
+from transphonator.pipeline.base_transliterator import BaseTransliterator
+from transphonator.service.server import MicroBatcher, TranslitServer
+
+
+class UpperPipeline(BaseTransliterator):
+    """Stand-in pipeline that upper-cases words, optionally slowly."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.batches = []
+        self.threads = set()
+
+    def transphonate(self, word):
+        return self.transphonate_batch([word])[0]
+
+    def transphonate_batch(self, words):
+        self.threads.add(threading.get_ident())
+        self.batches.append(list(words))
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return [word.upper() if word else None for word in words]
+
+
+async def request(port, raw):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(raw)
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split()[1])
+    length = int(head.lower().split(b"content-length:")[1].split()[0])
+    body = json.loads(await reader.readexactly(length))
+    writer.close()
+    return status, body
+
+
+def post(words):
+    body = json.dumps({"words": words}).encode()
+    return (
+        b"POST /transphonate HTTP/1.1\r\n"
+        + f"Content-Length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+
+
+def serve(server, client):
+    """Run `client(port)` against `server` on a free port."""
+
+    async def main():
+        tcp_server = await asyncio.start_server(
+            server.handle_connection, "127.0.0.1", 0
+        )
+        port = tcp_server.sockets[0].getsockname()[1]
+        async with tcp_server:
+            return await client(port)
+
+    try:
+        return asyncio.run(main())
+    finally:
+        server.batcher.close()
+
+
+def test_get_and_post():
+    server = TranslitServer(UpperPipeline())
+
+    async def client(port):
+        return await asyncio.gather(
+            request(port, b"GET /transphonate?word=abc HTTP/1.1\r\n\r\n"),
+            request(port, post(["x", "yz"])),
+        )
+
+    (get_status, get_body), (post_status, post_body) = serve(server, client)
+
+    assert (get_status, get_body) == (
+        200, {"word": "abc", "transliteration": "ABC"}
+    )
+    assert post_status == 200
+    assert post_body["results"] == [
+        {"word": "x", "transliteration": "X"},
+        {"word": "yz", "transliteration": "YZ"},
+    ]
+
+
+def test_concurrent_requests_are_batched_off_the_loop():
+    pipeline = UpperPipeline()
+    server = TranslitServer(pipeline, max_batch_size=1000, max_delay=0.05)
+
+    async def client(port):
+        return await asyncio.gather(
+            *(request(port, post([f"w{i}"])) for i in range(20))
+        )
+
+    responses = serve(server, client)
+
+    transliterations = [
+        body["results"][0]["transliteration"] for _, body in responses
+    ]
+    assert transliterations == [f"W{i}" for i in range(20)]
+    assert len(pipeline.batches) < 20
+    assert threading.get_ident() not in pipeline.threads
+
+
+def test_loop_serves_stats_while_batch_runs():
+    server = TranslitServer(UpperPipeline(delay=0.5), max_delay=0)
+
+    async def client(port):
+        batch = asyncio.ensure_future(request(port, post(["slow"])))
+        await asyncio.sleep(0.1)
+        start = time.perf_counter()
+        status, _ = await request(port, b"GET /stats HTTP/1.1\r\n\r\n")
+        stats_time = time.perf_counter() - start
+        await batch
+        return status, stats_time
+
+    status, stats_time = serve(server, client)
+
+    assert status == 200
+    assert stats_time < 0.3
+
+
+def test_malformed_request_line_gets_error_response():
+    server = TranslitServer(UpperPipeline())
+
+    async def client(port):
+        return await request(port, b"GARBAGE\r\n\r\n")
+
+    status, body = serve(server, client)
+
+    assert status == 400
+    assert "error" in body
+
+
+def test_pipeline_error_gets_error_response():
+    server = TranslitServer(UpperPipeline(error=RuntimeError("boom")))
+
+    async def client(port):
+        return await request(port, post(["x"]))
+
+    assert serve(server, client) == (500, {"error": "boom"})
+
+
+def test_failed_batch_skips_cancelled_requests():
+    batcher = MicroBatcher(
+        UpperPipeline(delay=0.1, error=RuntimeError("boom")), max_delay=0
+    )
+
+    async def main():
+        cancelled = asyncio.ensure_future(batcher.transphonate(["a"]))
+        waiting = asyncio.ensure_future(batcher.transphonate(["b"]))
+        await asyncio.sleep(0.05)
+        cancelled.cancel()
+        return await asyncio.gather(waiting, return_exceptions=True)
+
+    try:
+        (error,) = asyncio.run(main())
+    finally:
+        batcher.close()
+
+    assert isinstance(error, RuntimeError)
@@ -0,0 +1,92 @@
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+from transphonator.utils import sstable
+from transphonator.utils.sstable import (
+    HEADER_FORMAT,
+    HEADER_SIZE,
+    SortedStringTable,
+    write_table,
+)
+
+ITEMS = {
+    b"hello": b"\x01\x02",
+    b"world": b"\x03",
+    b"\xd8\xa8": b"",
+    b"a": b"\x00\x00\x00",
+}
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "table.lex")
+    write_table(path, ITEMS.items(), metadata={"symbols": ["AA", "B"]})
+
+    table = SortedStringTable(path)
+    assert len(table) == len(ITEMS)
+    assert table.metadata == {"symbols": ["AA", "B"]}
+    for key, value in ITEMS.items():
+        assert table.get(key) == value
+        assert key in table
+    assert table.get(b"missing") is None
+    assert table.get(b"") is None
+    assert list(table.items()) == sorted(ITEMS.items())
+    table.close()
+
+
+def test_empty_table(tmp_path):
+    path = str(tmp_path / "table.lex")
+    write_table(path, [])
+
+    table = SortedStringTable(path)
+    assert len(table) == 0
+    assert table.get(b"hello") is None
+    table.close()
+
+
+def test_offsets_are_little_endian(tmp_path):
+    path = tmp_path / "table.lex"
+    write_table(str(path), ITEMS.items())
+
+    data = path.read_bytes()
+    _, _, count, metadata_size = struct.unpack_from(HEADER_FORMAT, data)
+    offsets_start = HEADER_SIZE + metadata_size
+    keys_offsets = struct.unpack_from(f"<{count + 1}I", data, offsets_start)
+    assert keys_offsets[-1] == sum(len(key) for key in ITEMS)
+
+
+def test_round_trip_on_big_endian(tmp_path, monkeypatch):
+    monkeypatch.setattr(sstable, "sys", SimpleNamespace(byteorder="big"))
+    path = str(tmp_path / "table.lex")
+    write_table(path, ITEMS.items())
+
+    table = SortedStringTable(path)
+    assert dict(table.items()) == ITEMS
+    table.close()
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "table.lex"
+    path.write_bytes(b"\x00" * 64)
+
+    with pytest.raises(ValueError):
+        SortedStringTable(str(path))
+
+
+def test_lexicon_retriever_matches_cmu_retriever(tmp_path):
+    from transphonator.phoneme.cmu_retriever import CMURetriever
+    from transphonator.phoneme.lexicon_retriever import LexiconRetriever
+
+    cmu_dict = tmp_path / "cmudict.txt"
+    cmu_dict.write_text(
+        ";;; comment\nHELLO  HH AH0 L OW1\nWORLD  W ER1 L D\n",
+        encoding="ISO-8859-1",
+    )
+    fallback = tmp_path / "fallback.txt"
+    fallback.write_text("hello X\nnaruhito N AA R UW\n", encoding="utf-8")
+
+    cmu = CMURetriever(str(cmu_dict), str(fallback), use_cache=False)
+    lexicon = LexiconRetriever.from_dicts(str(cmu_dict), str(fallback))
+    for word in ["hello", "World", "naruhito", "missing"]:
+        assert lexicon.get_phonemes(word) == cmu.get_phonemes(word)
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from transphonator.pipeline.transducer_transliterator import (
+    TranslitTransducer,
+    parse_rule_pattern,
+)
+from transphonator.translit_maps.arabic_map import (
+    ARPABET_SYMBOLS,
+    TranslitMapAra,
+)
+from transphonator.translit_maps.base_map import BaseTranslitMap
+from transphonator.translit_rules.arabic_rules import TranslitRuleAra
+
+
+class CharMap(BaseTranslitMap):
+    """Maps each phoneme to itself, to feed any text to the rules."""
+
+    def get_equivalent(self, phoneme):
+        return phoneme
+
+
+def test_parse_rule_pattern():
+    assert parse_rule_pattern(r"^[a\-c]b(?=[d-f])$") == (
+        True,
+        [frozenset("a-c"), frozenset("b")],
+        [frozenset("def")],
+        True,
+    )
+    for pattern in ["a+", "a|b", "[^a]", r"\d", "(a)", "a(?=b"]:
+        with pytest.raises(ValueError):
+            parse_rule_pattern(pattern)
+
+
+def test_max_context_derived_from_rules():
+    transducer = TranslitTransducer(TranslitMapAra(), TranslitRuleAra())
+
+    assert transducer.max_context == 3
+
+
+def test_transducer_matches_map_then_rules():
+    transliteration_map = TranslitMapAra()
+    rules = TranslitRuleAra()
+    transducer = TranslitTransducer(transliteration_map, rules)
+    phonemes = ARPABET_SYMBOLS + ["XX9"]
+    rng = random.Random(0)
+
+    for _ in range(5000):
+        word = rng.choices(phonemes, k=rng.randint(0, 12))
+        expected = rules.apply(
+            "".join(transliteration_map.get_equivalent(p) for p in word)
+        )
+        assert transducer.transduce(word) == expected
+
+
+def test_transducer_matches_rules_on_any_text():
+    # Single characters exercise every rule, including the "ng" rules that
+    # the Arabic map never triggers
+    rules = TranslitRuleAra()
+    transducer = TranslitTransducer(CharMap(), rules)
+    alphabet = "نقباَُِأوي "
+    rng = random.Random(0)
+
+    for _ in range(20000):
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 8)))
+        assert transducer.transduce(list(text)) == rules.apply(text)